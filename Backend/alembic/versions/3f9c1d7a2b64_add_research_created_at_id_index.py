@@ -0,0 +1,33 @@
+"""Add research created_at/id index for keyset pagination
+
+Revision ID: 3f9c1d7a2b64
+Revises: 6b1e2e689832
+Create Date: 2026-10-14 09:12:31.418202
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '3f9c1d7a2b64'
+down_revision: Union[str, Sequence[str], None] = '6b1e2e689832'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_index(
+        'ix_research_created_at_id',
+        'research',
+        [sa.text('created_at DESC'), sa.text('id DESC')],
+        unique=False
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_research_created_at_id', table_name='research')
@@ -0,0 +1,36 @@
+"""Cascade source deletes from research
+
+Revision ID: 5e1b8f3a9c42
+Revises: c4a7e91f0d25
+Create Date: 2026-10-14 11:20:54.127736
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '5e1b8f3a9c42'
+down_revision: Union[str, Sequence[str], None] = 'c4a7e91f0d25'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.drop_constraint('sources_research_id_fkey', 'sources', type_='foreignkey')
+    op.create_foreign_key(
+        'sources_research_id_fkey', 'sources', 'research',
+        ['research_id'], ['id'], ondelete='CASCADE'
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_constraint('sources_research_id_fkey', 'sources', type_='foreignkey')
+    op.create_foreign_key(
+        'sources_research_id_fkey', 'sources', 'research',
+        ['research_id'], ['id']
+    )
@@ -0,0 +1,30 @@
+"""Add summary and metadata_info to sources
+
+Revision ID: 8d2e4b6c1f37
+Revises: 3f9c1d7a2b64
+Create Date: 2026-10-14 10:02:47.553190
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '8d2e4b6c1f37'
+down_revision: Union[str, Sequence[str], None] = '3f9c1d7a2b64'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('sources', sa.Column('summary', sa.Text(), nullable=True))
+    op.add_column('sources', sa.Column('metadata_info', sa.JSON(), nullable=True))
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_column('sources', 'metadata_info')
+    op.drop_column('sources', 'summary')
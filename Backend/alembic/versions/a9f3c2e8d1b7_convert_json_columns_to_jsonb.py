@@ -0,0 +1,45 @@
+"""Convert JSON columns to JSONB
+
+Revision ID: a9f3c2e8d1b7
+Revises: 5e1b8f3a9c42
+Create Date: 2026-10-14 11:58:13.690451
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'a9f3c2e8d1b7'
+down_revision: Union[str, Sequence[str], None] = '5e1b8f3a9c42'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+JSON_COLUMNS = [
+    ('research', 'key_findings'),
+    ('research', 'metadata_info'),
+    ('sources', 'metadata_info'),
+]
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    for table, column in JSON_COLUMNS:
+        op.alter_column(
+            table, column,
+            type_=postgresql.JSONB(astext_type=sa.Text()),
+            postgresql_using=f'{column}::jsonb'
+        )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    for table, column in JSON_COLUMNS:
+        op.alter_column(
+            table, column,
+            type_=sa.JSON(),
+            postgresql_using=f'{column}::json'
+        )
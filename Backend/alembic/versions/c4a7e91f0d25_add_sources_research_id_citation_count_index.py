@@ -0,0 +1,33 @@
+"""Add sources research_id/citation_count index
+
+Revision ID: c4a7e91f0d25
+Revises: 8d2e4b6c1f37
+Create Date: 2026-10-14 10:41:09.806315
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c4a7e91f0d25'
+down_revision: Union[str, Sequence[str], None] = '8d2e4b6c1f37'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_index(
+        'ix_sources_research_id_citation_count',
+        'sources',
+        ['research_id', 'citation_count'],
+        unique=False
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_sources_research_id_citation_count', table_name='sources')
@@ -0,0 +1,36 @@
+"""Add research status/created_at/id index
+
+Revision ID: e2b6d4f8a3c1
+Revises: a9f3c2e8d1b7
+Create Date: 2026-10-14 12:35:40.281937
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e2b6d4f8a3c1'
+down_revision: Union[str, Sequence[str], None] = 'a9f3c2e8d1b7'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_index(
+        'ix_research_status_created_id',
+        'research',
+        ['status', sa.text('created_at DESC'), sa.text('id DESC')],
+        unique=False
+    )
+    # The composite index's leading column already covers status lookups
+    op.drop_index(op.f('ix_research_status'), table_name='research')
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.create_index(op.f('ix_research_status'), 'research', ['status'], unique=False)
+    op.drop_index('ix_research_status_created_id', table_name='research')
@@ -0,0 +1,41 @@
+"""Add unique (research_id, url) constraint to sources
+
+Revision ID: f7c3a1d9e5b2
+Revises: e2b6d4f8a3c1
+Create Date: 2026-10-14 13:08:22.514603
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'f7c3a1d9e5b2'
+down_revision: Union[str, Sequence[str], None] = 'e2b6d4f8a3c1'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Retried tasks may already have saved a source twice; the copies match on title
+    # as well as URL, so keep the first one
+    op.execute(
+        'DELETE FROM sources a USING sources b '
+        'WHERE a.research_id = b.research_id AND a.url = b.url '
+        'AND a.title = b.title AND a.id > b.id'
+    )
+    # Papers with no PDF link or DOI used to share a bare https://doi.org/ URL. They are
+    # distinct papers with no real link, so the row id keeps each one under the constraint
+    op.execute(
+        "UPDATE sources SET url = url || '#' || id "
+        "WHERE url IN ('https://doi.org/', 'https://doi.org/None')"
+    )
+    op.create_unique_constraint('uq_sources_research_id_url', 'sources', ['research_id', 'url'])
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_constraint('uq_sources_research_id_url', 'sources', type_='unique')
@@ -1,58 +1,84 @@
-from fastapi import APIRouter, Depends, HTTPException, Query
-from sqlalchemy.orm import Session
-from typing import List
+from cachetools import TTLCache
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response
+from sqlalchemy import Float, case, cast, delete, func, insert, select, text, tuple_
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session, raiseload, selectinload
+from typing import List, Optional, Tuple
 from datetime import datetime
+import base64
+import csv
+import hashlib
+import io
+import re
+from uuid import uuid4
+import orjson
 
-from app.core.database import get_db
+from app.core.cache import cache_delete, cache_get, cache_set
+from app.core.config import settings
+from app.core.database import SessionLocal, get_async_db, get_db
 from app.models.database import Research, Source
 from app.tasks.celery_app import celery_app
 from app.models.schemas import (
     ResearchRequest, ResearchResponse, ResearchCreateResponse,
-    ResearchSummary, ResearchListResponse, HealthResponse, SourceType
+    ResearchBatchRequest, ResearchBatchCreateResponse,
+    ResearchSummary, ResearchListResponse, HealthResponse
 )
-from app.tasks.research_tasks import process_research_task
 
 
+# Sent by name so the API process never imports the task module and its fetcher/AI dependencies
+PROCESS_RESEARCH_TASK = "app.tasks.research_tasks.process_research_task"
+PROCESS_RESEARCH_BATCH_TASK = "app.tasks.research_tasks.process_research_batch"
+
 router = APIRouter()
 
+def _research_cache_key(research_id: int, kind: str) -> str:
+    """Redis key for a cached response; bump the version suffix when the payload shape changes"""
+    return f"research:{research_id}:{kind}:v1"
+
+def _cached_json_response(request: Request, payload: bytes) -> Response:
+    """Serve a cached JSON payload with an ETag, or 304 when the client already has it"""
+    etag = f'"{hashlib.sha1(payload).hexdigest()}"'
+    if request.headers.get("if-none-match") == etag:
+        return Response(status_code=304, headers={"ETag": etag})
+    return Response(content=payload, media_type="application/json", headers={"ETag": etag})
+
+def _research_values(request: ResearchRequest, task_id: str) -> dict:
+    """Column values for a new pending research row"""
+    return {
+        "query": request.query,
+        "status": "pending",
+        "max_results": request.max_results,
+        "include_summary": request.include_summary,
+        "language": request.language,
+        "metadata_info": {
+            "source_types": [st.value for st in request.source_types],
+            "created_via": "api",
+            "date_from": request.date_from,
+            "min_citations": request.min_citations,
+            "selected_sources": request.sources,
+            "task_id": task_id,
+        }
+    }
+
 @router.post("/start", response_model=ResearchCreateResponse)
 async def start_research(
     request: ResearchRequest,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Start a new research task in background"""
     try:
-        # Fallback for source_types validation
-        if not request.source_types or not all(isinstance(st, SourceType) for st in request.source_types):
-            request.source_types = [SourceType.ACADEMIC]  # Default to academic for new logic
+        # Pick the task ID up front so it is stored with the initial INSERT
+        task_id = str(uuid4())
         
-        # Create new research record
-        research = Research(
-            query=request.query,
-            status="pending",
-            max_results=request.max_results,
-            include_summary=request.include_summary,
-            language=request.language,
-            metadata_info={
-                "source_types": [st.value for st in request.source_types],
-                "created_via": "api",
-                "date_from": request.date_from,
-                "min_citations": request.min_citations,
-                "selected_sources": request.sources,
-            }
-        )
+        # Create new research record; an empty sources list means validation never lazy-loads it
+        research = Research(**_research_values(request, task_id), sources=[])
         
         db.add(research)
-        db.commit()
-        db.refresh(research)
-
-
-        # Start background task
-        task = process_research_task.delay(research.id)
+        # created_at comes back through INSERT ... RETURNING and expire_on_commit is off, so no refresh
+        await db.commit()
         
-        # Store task ID in metadata
-        research.metadata_info["task_id"] = task.id
-        db.commit()
+        # Start background task once the row is committed and visible to the worker
+        task = celery_app.send_task(PROCESS_RESEARCH_TASK, args=[research.id], task_id=task_id)
         
         # Convert to response model
         research_response = ResearchResponse.model_validate(research)
@@ -63,78 +89,197 @@ async def start_research(
         )
             
     except Exception as e:
-        db.rollback()
+        await db.rollback()
+        raise HTTPException(status_code=500, detail=f"Failed to create research: {str(e)}")
+
+@router.post("/start/batch", response_model=ResearchBatchCreateResponse)
+async def start_research_batch(
+    batch: ResearchBatchRequest,
+    db: AsyncSession = Depends(get_async_db)
+):
+    """Start several research tasks with a single multi-row INSERT"""
+    try:
+        task_ids = [str(uuid4()) for _ in batch.research]
+        rows = [_research_values(request, task_id) for request, task_id in zip(batch.research, task_ids)]
+        
+        result = await db.execute(
+            insert(Research).returning(Research.id, sort_by_parameter_order=True),
+            rows
+        )
+        research_ids = list(result.scalars())
+        await db.commit()
+        
+        for research_id, task_id in zip(research_ids, task_ids):
+            # Bulk submissions go through the batching task, which shares one session and analyzer
+            celery_app.send_task(PROCESS_RESEARCH_BATCH_TASK, args=[research_id], task_id=task_id)
+        
+        return ResearchBatchCreateResponse(
+            message=f"Started {len(research_ids)} research tasks",
+            research_ids=research_ids,
+            task_ids=task_ids
+        )
+    
+    except Exception as e:
+        await db.rollback()
         raise HTTPException(status_code=500, detail=f"Failed to create research: {str(e)}")
 
 @router.get("/{research_id}", response_model=ResearchResponse)
 async def get_research(
     research_id: int,
-    db: Session = Depends(get_db)
+    request: Request,
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Get research by ID with all sources"""
-    research = db.query(Research).filter(Research.id == research_id).first()
+    # Completed research no longer changes, so its serialized response is cached
+    cache_key = _research_cache_key(research_id, "detail")
+    cached = await cache_get(cache_key)
+    if cached is not None:
+        return _cached_json_response(request, cached)
+    
+    # Load sources in one IN query up front rather than lazily during serialization
+    result = await db.execute(
+        select(Research)
+        .options(selectinload(Research.sources))
+        .where(Research.id == research_id)
+    )
+    research = result.scalar_one_or_none()
     
     if not research:
         raise HTTPException(status_code=404, detail="Research not found")
     
-    return ResearchResponse.model_validate(research)
+    response = ResearchResponse.model_validate(research)
+    if research.status != "completed":
+        return response
+    
+    payload = orjson.dumps(response.model_dump(mode="json"))
+    await cache_set(cache_key, payload, settings.research_cache_ttl)
+    return _cached_json_response(request, payload)
+
+def _ensure_research_exists(db: Session, research_id: int) -> None:
+    """404 unless the research row exists, without loading any of its columns"""
+    exists = db.query(db.query(Research.id).filter(Research.id == research_id).exists()).scalar()
+    if not exists:
+        raise HTTPException(status_code=404, detail="Research not found")
+
+def _encode_cursor(research: Research) -> str:
+    """Build an opaque keyset cursor from the last row of a page"""
+    raw = f"{research.created_at.isoformat()}|{research.id}"
+    return base64.urlsafe_b64encode(raw.encode()).decode()
+
+def _decode_cursor(cursor: str) -> Tuple[datetime, int]:
+    """Decode a cursor produced by _encode_cursor into (created_at, id)"""
+    try:
+        raw = base64.urlsafe_b64decode(cursor.encode()).decode()
+        created_at, research_id = raw.rsplit("|", 1)
+        return datetime.fromisoformat(created_at), int(research_id)
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+
+# Exact unfiltered totals are reused briefly; a list page tolerates a slightly stale total
+_research_total_cache = TTLCache(maxsize=1, ttl=30)
+
+async def _count_research(db: AsyncSession, filters: list, exact_count: bool) -> Optional[int]:
+    """Total for page-number pagination: exact, cached, estimated or omitted"""
+    if not exact_count:
+        if filters:
+            # The planner estimate only covers the whole table
+            return None
+        estimate = await db.scalar(text("SELECT reltuples::bigint FROM pg_class WHERE relname = 'research'"))
+        # reltuples is -1 until the table has been vacuumed or analyzed
+        return estimate if estimate is not None and estimate >= 0 else None
+    
+    if filters:
+        return await db.scalar(select(func.count(Research.id)).where(*filters))
+    
+    total = _research_total_cache.get("research")
+    if total is None:
+        total = await db.scalar(select(func.count(Research.id)))
+        _research_total_cache["research"] = total
+    return total
 
 @router.get("/", response_model=ResearchListResponse)
 async def list_research(
-    page: int = Query(1, ge=1, description="Page number"),
+    page: int = Query(1, ge=1, description="Page number (ignored when cursor is given)"),
     page_size: int = Query(20, ge=1, le=100, description="Items per page"),
     status: str = Query(None, description="Filter by status"),
-    db: Session = Depends(get_db)
+    cursor: Optional[str] = Query(None, description="Cursor from a previous response's next_cursor"),
+    exact_count: bool = Query(False, description="Count rows exactly instead of using the table estimate"),
+    db: AsyncSession = Depends(get_async_db)
 ):
-    """List all research with pagination"""
+    """List all research with cursor (keyset) or page-number pagination"""
     # Build query
-    query = db.query(Research)
+    statement = select(Research)
+    if settings.sql_raiseload:
+        # Summaries never need relationships; fail loudly instead of lazy loading per row
+        statement = statement.options(raiseload("*"))
     
     # Apply status filter if provided
-    if status:
-        query = query.filter(Research.status == status)
-    
-    # Get total count
-    total = query.count()
+    filters = [Research.status == status] if status else []
+    statement = statement.where(*filters)
+    
+    # id breaks ties between rows created in the same instant
+    statement = statement.order_by(Research.created_at.desc(), Research.id.desc())
+    
+    if cursor:
+        # Keyset pagination: seek past the last row seen, no count and no skipped rows
+        created_at, last_id = _decode_cursor(cursor)
+        statement = statement.where(tuple_(Research.created_at, Research.id) < tuple_(created_at, last_id))
+        total = None
+        page = None
+    else:
+        # Page-number pagination kept for existing clients
+        total = await _count_research(db, filters, exact_count)
+        statement = statement.offset((page - 1) * page_size)
+    
+    # Correlated count keeps source_count in the same SELECT instead of one query per row
+    source_count_column = (
+        select(func.count(Source.id))
+        .where(Source.research_id == Research.id)
+        .correlate(Research)
+        .scalar_subquery()
+        .label("source_count")
+    )
     
-    # Apply pagination
-    offset = (page - 1) * page_size
-    research_list = query.order_by(Research.created_at.desc()).offset(offset).limit(page_size).all()
+    # Fetch one extra row to know whether another page exists
+    rows = (await db.execute(statement.add_columns(source_count_column).limit(page_size + 1))).all()
+    has_more = len(rows) > page_size
+    research_list = rows[:page_size]
+    next_cursor = _encode_cursor(research_list[-1][0]) if has_more else None
     
     # Convert to summary models
     research_summaries = []
-    for research in research_list:
-        # Temporary fix: count only by ID to avoid missing column issues
-        source_count = db.query(Source.id).filter(Source.research_id == research.id).count()
+    for research, source_count in research_list:
         summary = ResearchSummary.model_validate(research)
         summary.source_count = source_count
         research_summaries.append(summary)
     
     return ResearchListResponse(
-        message=f"Found {total} research records",
+        message=f"Found {total if total is not None else len(research_summaries)} research records",
         research_list=research_summaries,
         total=total,
         page=page,
-        page_size=page_size
+        page_size=page_size,
+        next_cursor=next_cursor,
+        has_more=has_more
     )
 
 @router.delete("/{research_id}")
 async def delete_research(
     research_id: int,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Delete research by ID"""
-    research = db.query(Research).filter(Research.id == research_id).first()
+    # One statement; the sources foreign key cascades the delete in the database
+    result = await db.execute(delete(Research).where(Research.id == research_id))
+    await db.commit()
     
-    if not research:
+    if result.rowcount == 0:
         raise HTTPException(status_code=404, detail="Research not found")
     
-    # Delete associated sources first
-    db.query(Source).filter(Source.research_id == research_id).delete()
-    
-    # Delete research
-    db.delete(research)
-    db.commit()
+    await cache_delete(
+        _research_cache_key(research_id, "detail"),
+        _research_cache_key(research_id, "summary")
+    )
     
     return {"message": f"Research {research_id} deleted successfully"}
 
@@ -144,7 +289,10 @@ async def get_research_status(
     db: Session = Depends(get_db)
 ):
     """Get detailed research task status"""
-    research = db.query(Research).filter(Research.id == research_id).first()
+    research = db.query(
+        Research.status, Research.created_at, Research.completed_at,
+        Research.error_message, Research.metadata_info
+    ).filter(Research.id == research_id).first()
     
     if not research:
         raise HTTPException(status_code=404, detail="Research not found")
@@ -172,45 +320,162 @@ async def get_research_status(
 
 # New enhanced endpoints
 
+EXPORT_MEDIA_TYPES = {
+    'csv': 'text/csv',
+    'json': 'application/json',
+    'excel': 'application/vnd.openxmlformats-officedocument.spreadsheetml.sheet',
+    'parquet': 'application/vnd.apache.parquet',
+    'bibtex': 'application/x-bibtex'
+}
+
+BIBTEX_KEY_RE = re.compile(r'\W+')
+
+EXPORT_FIELDS = [
+    'title', 'authors', 'year', 'venue', 'abstract', 'pdf_url',
+    'citation_count', 'source', 'doi', 'relevance_score'
+]
+
+# Columns the export and analytics endpoints read; selecting them directly
+# returns plain rows and skips building an ORM instance per source
+SOURCE_ROW_COLUMNS = (
+    Source.title, Source.url, Source.summary, Source.citation_count,
+    Source.doi, Source.relevance_score, Source.metadata_info
+)
+
+def _select_source_rows(research_id: int):
+    """Core SELECT of SOURCE_ROW_COLUMNS for one research, fetched in chunks"""
+    return (
+        select(*SOURCE_ROW_COLUMNS)
+        .where(Source.research_id == research_id)
+        .execution_options(yield_per=500)
+    )
+
+def _source_year_column():
+    """metadata_info year as a number for SQL comparisons and aggregates.
+
+    Years are stored as JSON numbers or strings (possibly empty), so the
+    cast sits behind a CASE that yields NULL for anything non-numeric.
+    """
+    year_text = Source.metadata_info['year'].as_string()
+    return case((year_text.regexp_match(r'^[0-9]+(\.[0-9]+)?$'), cast(year_text, Float)))
+
+def _format_year(year: Optional[float]) -> Optional[int]:
+    return int(year) if year is not None else None
+
+def _source_export_row(source) -> dict:
+    """Flatten a source row into the layout used by every export format"""
+    metadata = source.metadata_info
+    return {
+        'title': source.title,
+        'authors': metadata.get('authors', []) if metadata else [],
+        'year': metadata.get('year') if metadata else None,
+        'venue': metadata.get('venue') if metadata else None,
+        'abstract': source.summary,
+        'pdf_url': source.url if source.url.endswith('.pdf') else None,
+        'citation_count': source.citation_count or 0,
+        'source': metadata.get('source_api') if metadata else 'unknown',
+        'doi': source.doi,
+        'relevance_score': source.relevance_score
+    }
+
+def _iter_export_rows(research_id: int):
+    """Yield export rows from a server-side cursor, 500 sources at a time.
+
+    Uses its own session because the request session is closed before a
+    streaming response body is consumed.
+    """
+    db = SessionLocal()
+    try:
+        for source in db.execute(_select_source_rows(research_id)):
+            yield _source_export_row(source)
+    finally:
+        db.close()
+
+def _stream_csv(rows):
+    """Encode rows as CSV one line at a time"""
+    buffer = io.StringIO()
+    writer = csv.DictWriter(buffer, fieldnames=EXPORT_FIELDS)
+    writer.writeheader()
+    for row in rows:
+        writer.writerow(row)
+        yield buffer.getvalue()
+        buffer.seek(0)
+        buffer.truncate(0)
+    yield buffer.getvalue()
+
+def _stream_json(rows):
+    """Encode rows as a JSON array one record at a time"""
+    yield b"["
+    separator = b""
+    for row in rows:
+        yield separator + orjson.dumps(row)
+        separator = b","
+    yield b"]"
+
+def _stream_bibtex(rows):
+    """Encode rows as BibTeX entries one at a time"""
+    separator = ""
+    for paper in rows:
+        year = paper['year'] if paper['year'] is not None else ''
+        key = BIBTEX_KEY_RE.sub('', paper['title'][:20].lower()) + str(year)
+        fields = [f"  title={{{paper['title']}}}"]
+        if paper['authors']:
+            fields.append(f"  author={{{' and '.join(paper['authors'])}}}")
+        if paper['year']:
+            fields.append(f"  year={{{paper['year']}}}")
+        if paper['venue']:
+            fields.append(f"  journal={{{paper['venue']}}}")
+        if paper['doi']:
+            fields.append(f"  doi={{{paper['doi']}}}")
+        if paper['pdf_url']:
+            fields.append(f"  url={{{paper['pdf_url']}}}")
+        entry_type = "article" if paper['venue'] else "misc"
+        yield f"{separator}@{entry_type}{{{key},\n" + ",\n".join(fields) + "\n}"
+        separator = "\n\n"
+
+STREAMED_EXPORTS = {
+    'csv': _stream_csv,
+    'json': _stream_json,
+    'bibtex': _stream_bibtex
+}
+
 @router.get("/{research_id}/export")
 async def export_research(
     research_id: int,
-    format: str = Query("json", description="Export format: csv, json, excel, bibtex"),
+    format: str = Query("json", description="Export format: csv, json, excel, parquet, bibtex"),
     db: Session = Depends(get_db)
 ):
     """Export research results in various formats"""
-    from fastapi.responses import FileResponse
-    from app.services.academic_fetcher import EnhancedAcademicFetcher
-    import pandas as pd
-    import tempfile
-    import os
+    from fastapi.responses import FileResponse, StreamingResponse
+    from starlette.background import BackgroundTask
     
-    research = db.query(Research).filter(Research.id == research_id).first()
-    if not research:
-        raise HTTPException(status_code=404, detail="Research not found")
+    if format not in EXPORT_MEDIA_TYPES:
+        raise HTTPException(status_code=400, detail=f"Unsupported format: {format}")
+    
+    _ensure_research_exists(db, research_id)
     
-    # Get sources data
-    sources = db.query(Source).filter(Source.research_id == research_id).all()
-    if not sources:
+    if not db.query(Source.id).filter(Source.research_id == research_id).first():
         raise HTTPException(status_code=404, detail="No sources found for this research")
     
-    # Convert to DataFrame format
-    papers_data = []
-    for source in sources:
-        papers_data.append({
-            'title': source.title,
-            'authors': source.metadata.get('authors', []) if source.metadata else [],
-            'year': source.metadata.get('year') if source.metadata else None,
-            'venue': source.metadata.get('venue') if source.metadata else None,
-            'abstract': source.summary,
-            'pdf_url': source.url if source.url.endswith('.pdf') else None,
-            'citation_count': source.citation_count or 0,
-            'source': source.metadata.get('source_api') if source.metadata else 'unknown',
-            'doi': source.doi,
-            'relevance_score': source.relevance_score
-        })
+    download_name = f"research_{research_id}_results.{format}"
     
-    df = pd.DataFrame(papers_data)
+    # Text formats are written straight to the socket without pandas or a temp file
+    if format in STREAMED_EXPORTS:
+        body = STREAMED_EXPORTS[format](_iter_export_rows(research_id))
+        return StreamingResponse(
+            body,
+            media_type=EXPORT_MEDIA_TYPES[format],
+            headers={"Content-Disposition": f'attachment; filename="{download_name}"'}
+        )
+    
+    # Only Excel and Parquet need pandas (and openpyxl/pyarrow), so the import stays on this path
+    from app.services.academic_fetcher import get_fetcher
+    import pandas as pd
+    import tempfile
+    import os
+    
+    # Convert sources to DataFrame format
+    df = pd.DataFrame([_source_export_row(source) for source in db.execute(_select_source_rows(research_id))])
     
     # Create temporary file
     with tempfile.NamedTemporaryFile(delete=False, suffix=f'.{format}') as tmp_file:
@@ -218,21 +483,15 @@ async def export_research(
     
     try:
         # Use EnhancedAcademicFetcher export functionality
-        fetcher = EnhancedAcademicFetcher()
+        fetcher = get_fetcher()
         fetcher.export_results(df, filename, format=format)
         
-        # Return file
-        media_type = {
-            'csv': 'text/csv',
-            'json': 'application/json',
-            'excel': 'application/vnd.openxmlformats-officedocument.spreadsheetml.sheet',
-            'bibtex': 'application/x-bibtex'
-        }.get(format, 'application/octet-stream')
-        
+        # Return file and remove it once sent
         return FileResponse(
             filename,
-            media_type=media_type,
-            filename=f"research_{research_id}_results.{format}"
+            media_type=EXPORT_MEDIA_TYPES[format],
+            filename=download_name,
+            background=BackgroundTask(os.unlink, filename)
         )
     
     except Exception as e:
@@ -244,39 +503,61 @@ async def export_research(
 @router.get("/{research_id}/summary")
 async def get_research_summary(
     research_id: int,
+    request: Request,
     db: Session = Depends(get_db)
 ):
     """Get enhanced summary report for research"""
-    from app.services.academic_fetcher import EnhancedAcademicFetcher
-    import pandas as pd
-    
-    research = db.query(Research).filter(Research.id == research_id).first()
+    cache_key = _research_cache_key(research_id, "summary")
+    cached = await cache_get(cache_key)
+    if cached is not None:
+        return _cached_json_response(request, cached)
+    
+    research = db.query(
+        Research.query, Research.status, Research.created_at, Research.completed_at
+    ).filter(Research.id == research_id).first()
     if not research:
         raise HTTPException(status_code=404, detail="Research not found")
     
-    sources = db.query(Source).filter(Source.research_id == research_id).all()
-    if not sources:
-        return {"message": "No sources found for summary"}
+    in_research = Source.research_id == research_id
+    year = _source_year_column()
+    paper_count = func.count(Source.id)
     
-    # Convert to DataFrame for analysis
-    papers_data = []
-    for source in sources:
-        papers_data.append({
-            'title': source.title,
-            'authors': source.metadata.get('authors', []) if source.metadata else [],
-            'year': source.metadata.get('year') if source.metadata else None,
-            'venue': source.metadata.get('venue') if source.metadata else None,
-            'citation_count': source.citation_count or 0,
-            'source': source.metadata.get('source_api') if source.metadata else 'unknown',
-            'has_pdf': bool(source.url and source.url.endswith('.pdf')),
-            'relevance_score': source.relevance_score or 0
-        })
+    # Totals, averages and year bounds in one aggregate pass over the sources
+    total_papers, avg_citations, papers_with_pdf, min_year, max_year = db.query(
+        paper_count,
+        func.avg(func.coalesce(Source.citation_count, 0)),
+        func.count(case((Source.url.like('%.pdf'), 1))),
+        func.min(year),
+        func.max(year)
+    ).filter(in_research).one()
     
-    df = pd.DataFrame(papers_data)
+    if not total_papers:
+        return {"message": "No sources found for summary"}
     
-    # Generate enhanced summary using EnhancedAcademicFetcher
-    fetcher = EnhancedAcademicFetcher()
-    summary_report = fetcher.create_summary_report(df)
+    # Per-API and per-venue breakdowns are grouped in the database
+    source_api = func.coalesce(Source.metadata_info['source_api'].as_string(), 'unknown')
+    sources = db.query(source_api, paper_count).filter(in_research) \
+        .group_by(source_api).order_by(paper_count.desc()).all()
+    
+    venue = Source.metadata_info['venue'].as_string()
+    top_venues = db.query(venue, paper_count).filter(in_research, venue.isnot(None)) \
+        .group_by(venue).order_by(paper_count.desc()).limit(10).all()
+    
+    top_cited = db.query(Source.title, Source.citation_count, year.label('year')).filter(in_research) \
+        .order_by(Source.citation_count.desc().nulls_last()).limit(5).all()
+    
+    summary_report = {
+        'total_papers': total_papers,
+        'date_range': f"{_format_year(min_year)}-{_format_year(max_year)}",
+        'sources': dict(sources),
+        'top_venues': dict(top_venues),
+        'avg_citations': float(avg_citations),
+        'papers_with_pdf': papers_with_pdf,
+        'top_cited': [
+            {'title': paper.title, 'citation_count': paper.citation_count or 0, 'year': _format_year(paper.year)}
+            for paper in top_cited
+        ]
+    }
     
     # Add research-specific information
     summary_report.update({
@@ -287,7 +568,12 @@ async def get_research_summary(
         'completed_at': research.completed_at
     })
     
-    return summary_report
+    if research.status != "completed":
+        return summary_report
+    
+    payload = orjson.dumps(summary_report)
+    await cache_set(cache_key, payload, settings.research_cache_ttl)
+    return _cached_json_response(request, payload)
 
 @router.get("/{research_id}/filter")
 async def filter_research_results(
@@ -300,39 +586,12 @@ async def filter_research_results(
     db: Session = Depends(get_db)
 ):
     """Filter research results by various criteria"""
-    from app.services.academic_fetcher import EnhancedAcademicFetcher
-    import pandas as pd
+    _ensure_research_exists(db, research_id)
     
-    research = db.query(Research).filter(Research.id == research_id).first()
-    if not research:
-        raise HTTPException(status_code=404, detail="Research not found")
-    
-    sources = db.query(Source).filter(Source.research_id == research_id).all()
-    if not sources:
+    total_results = db.query(func.count(Source.id)).filter(Source.research_id == research_id).scalar()
+    if not total_results:
         return {"message": "No sources found to filter"}
     
-    # Convert to DataFrame
-    papers_data = []
-    for source in sources:
-        papers_data.append({
-            'title': source.title,
-            'authors': source.metadata.get('authors', []) if source.metadata else [],
-            'year': source.metadata.get('year') if source.metadata else None,
-            'venue': source.metadata.get('venue') if source.metadata else None,
-            'abstract': source.summary,
-            'citation_count': source.citation_count or 0,
-            'source': source.metadata.get('source_api') if source.metadata else 'unknown',
-            'has_pdf': bool(source.url and source.url.endswith('.pdf')),
-            'relevance_score': source.relevance_score or 0,
-            'doi': source.doi,
-            'url': source.url
-        })
-    
-    df = pd.DataFrame(papers_data)
-    
-    # Apply filters using EnhancedAcademicFetcher
-    fetcher = EnhancedAcademicFetcher()
-    
     # Prepare filter parameters
     year_range = None
     if year_from or year_to:
@@ -342,35 +601,44 @@ async def filter_research_results(
     if venues:
         venue_list = [v.strip() for v in venues.split(',')]
     
-    # Apply filters
-    filtered_df = fetcher.filter_papers(
-        df,
-        year_range=year_range,
-        venues=venue_list,
-        min_citations=min_citations,
-        has_pdf=has_pdf
-    )
+    # Apply filters in SQL so rows that would be discarded never leave the database
+    statement = _select_source_rows(research_id)
+    
+    if year_range:
+        statement = statement.where(_source_year_column().between(*year_range))
+    
+    if venue_list:
+        statement = statement.where(Source.metadata_info['venue'].as_string().in_(venue_list))
+    
+    # Citation counts are never negative, so only a positive minimum filters anything
+    if min_citations is not None and min_citations > 0:
+        statement = statement.where(Source.citation_count >= min_citations)
+    
+    if has_pdf is not None:
+        is_pdf = Source.url.like('%.pdf')
+        statement = statement.where(is_pdf if has_pdf else ~is_pdf)
     
-    # Convert back to response format
+    # Convert to response format
     filtered_results = []
-    for _, paper in filtered_df.iterrows():
+    for source in db.execute(statement):
+        metadata = source.metadata_info
         filtered_results.append({
-            'title': paper['title'],
-            'authors': paper['authors'],
-            'year': paper['year'],
-            'venue': paper['venue'],
-            'abstract': paper['abstract'],
-            'citation_count': paper['citation_count'],
-            'source': paper['source'],
-            'has_pdf': paper['has_pdf'],
-            'relevance_score': paper['relevance_score'],
-            'doi': paper['doi'],
-            'url': paper['url']
+            'title': source.title,
+            'authors': metadata.get('authors', []) if metadata else [],
+            'year': metadata.get('year') if metadata else None,
+            'venue': metadata.get('venue') if metadata else None,
+            'abstract': source.summary,
+            'citation_count': source.citation_count or 0,
+            'source': metadata.get('source_api') if metadata else 'unknown',
+            'has_pdf': bool(source.url and source.url.endswith('.pdf')),
+            'relevance_score': source.relevance_score or 0,
+            'doi': source.doi,
+            'url': source.url
         })
     
     return {
         'research_id': research_id,
-        'total_results': len(df),
+        'total_results': total_results,
         'filtered_results': len(filtered_results),
         'filters_applied': {
             'year_range': year_range,
@@ -0,0 +1,63 @@
+import asyncio
+import functools
+import logging
+from typing import Any, Callable, Optional
+from weakref import WeakKeyDictionary
+
+import orjson
+import redis.asyncio as redis
+from redis.exceptions import RedisError
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+# Async Redis clients (same instance Celery uses as broker), one per event loop: the API
+# runs a single loop, but Celery tasks start a fresh one with every asyncio.run
+_clients: "WeakKeyDictionary[asyncio.AbstractEventLoop, redis.Redis]" = WeakKeyDictionary()
+
+def get_redis() -> redis.Redis:
+    """Redis client bound to the running event loop; connects lazily"""
+    loop = asyncio.get_running_loop()
+    client = _clients.get(loop)
+    if client is None:
+        client = _clients[loop] = redis.from_url(settings.redis_url)
+    return client
+
+# Cache helpers never raise: a Redis outage only costs the cache, not the request
+async def cache_get(key: str) -> Optional[bytes]:
+    try:
+        return await get_redis().get(key)
+    except RedisError as e:
+        logger.warning("Cache read failed for %s: %s", key, e)
+        return None
+
+async def cache_set(key: str, value: bytes, ttl: int) -> None:
+    try:
+        await get_redis().setex(key, ttl, value)
+    except RedisError as e:
+        logger.warning("Cache write failed for %s: %s", key, e)
+
+async def cache_delete(*keys: str) -> None:
+    try:
+        await get_redis().delete(*keys)
+    except RedisError as e:
+        logger.warning("Cache delete failed for %s: %s", keys, e)
+
+def cached_async(ttl: int, key_fn: Callable[..., str], cache_if: Callable[[Any], bool] = lambda result: True):
+    """Cache a coroutine's JSON-serializable result under key_fn(*args, **kwargs).
+    Exceptions and results rejected by cache_if are not stored."""
+    def decorator(func):
+        @functools.wraps(func)
+        async def wrapper(*args, **kwargs):
+            key = key_fn(*args, **kwargs)
+            cached = await cache_get(key)
+            if cached is not None:
+                return orjson.loads(cached)
+            
+            result = await func(*args, **kwargs)
+            if cache_if(result):
+                await cache_set(key, orjson.dumps(result), ttl)
+            return result
+        return wrapper
+    return decorator
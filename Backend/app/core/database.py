@@ -1,4 +1,6 @@
+import logging
 from sqlalchemy import create_engine
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker
 from app.core.config import settings
@@ -6,11 +8,32 @@ from app.core.config import settings
 # Create SQLAlchemy engine
 engine = create_engine(
     settings.database_url,
-    echo=True  # Shows SQL queries in console (good for development)
+    echo=settings.sql_echo,  # Logs every statement; development only
+    pool_size=settings.db_pool_size,
+    max_overflow=settings.db_max_overflow,
+    pool_timeout=settings.db_pool_timeout,
+    pool_recycle=settings.db_pool_recycle,
+    pool_pre_ping=True  # Drop dead connections before handing them out
 )
 
+# Async engine for endpoints that await the database instead of blocking the event loop
+async_engine = create_async_engine(
+    settings.database_url.replace("postgresql://", "postgresql+asyncpg://", 1),
+    echo=settings.sql_echo,
+    pool_size=settings.db_pool_size,
+    max_overflow=settings.db_max_overflow,
+    pool_timeout=settings.db_pool_timeout,
+    pool_recycle=settings.db_pool_recycle,
+    pool_pre_ping=True
+)
+
+# Keep SQLAlchemy's engine logger quiet unless echo is explicitly requested
+if not settings.sql_echo:
+    logging.getLogger("sqlalchemy.engine").setLevel(logging.WARNING)
+
 # Create SessionLocal class
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+AsyncSessionLocal = async_sessionmaker(async_engine, autoflush=False, expire_on_commit=False)
 
 # Create Base class for database models
 Base = declarative_base()
@@ -21,4 +44,9 @@ def get_db():
     try:
         yield db
     finally:
-        db.close()
\ No newline at end of file
+        db.close()
+
+# Dependency to get an async database session
+async def get_async_db():
+    async with AsyncSessionLocal() as db:
+        yield db
\ No newline at end of file
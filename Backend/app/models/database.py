@@ -1,4 +1,5 @@
-from sqlalchemy import Column, Integer, String, DateTime, Boolean, Text, Float, JSON, ForeignKey
+from sqlalchemy import Column, Integer, String, DateTime, Boolean, Text, Float, ForeignKey, Index, UniqueConstraint
+from sqlalchemy.dialects.postgresql import JSONB
 from sqlalchemy.sql import func
 from sqlalchemy.orm import relationship
 from app.core.database import Base
@@ -11,7 +12,7 @@ class Research(Base):
     
     # Basic research info
     query = Column(String(500), nullable=False, index=True)
-    status = Column(String(50), default="pending", index=True)  # pending, in_progress, completed, failed
+    status = Column(String(50), default="pending")  # pending, in_progress, completed, failed
     
     # Timestamps
     created_at = Column(DateTime(timezone=True), server_default=func.now())
@@ -24,14 +25,22 @@ class Research(Base):
     
     # Results
     summary = Column(Text, nullable=True)
-    key_findings = Column(JSON, nullable=True)  # Store as JSON array
+    key_findings = Column(JSONB, nullable=True)  # Store as JSON array
     error_message = Column(Text, nullable=True)
     
     # Metadata
-    metadata_info = Column(JSON, nullable=True)  # Store additional info as JSON
+    metadata_info = Column(JSONB, nullable=True)  # Store additional info as JSON
     
     # Relationship to sources
-    sources = relationship("Source", back_populates="research")
+    # Sources are removed by the database's ON DELETE CASCADE, not loaded and deleted one by one
+    sources = relationship("Source", back_populates="research", cascade="all, delete-orphan", passive_deletes=True)
+    
+    __table_args__ = (
+        # Matches the list ordering so keyset pagination is an index seek
+        Index("ix_research_created_at_id", created_at.desc(), id.desc()),
+        # Same ordering under a status filter; also serves plain status lookups
+        Index("ix_research_status_created_id", status, created_at.desc(), id.desc()),
+    )
 
 
 class Source(Base):
@@ -41,7 +50,7 @@ class Source(Base):
     id = Column(Integer, primary_key=True, index=True)
     
     # Link to research
-    research_id = Column(Integer, ForeignKey("research.id"), nullable=False, index=True)
+    research_id = Column(Integer, ForeignKey("research.id", ondelete="CASCADE"), nullable=False, index=True)
     
     # Source information
     title = Column(String(500), nullable=False)
@@ -60,10 +69,21 @@ class Source(Base):
     
     # Full content (if scraped)
     full_content = Column(Text, nullable=True)
+    summary = Column(Text, nullable=True)  # Abstract or extractive summary
+    
+    # Paper details (authors, year, venue, keywords, source_api) as JSON
+    metadata_info = Column(JSONB, nullable=True)
     
     # New fields for academic support
     doi = Column(String, nullable=True, index=True)
     citation_count = Column(Integer, default=0, index=True)
     
     # Relationship back to research
-    research = relationship("Research", back_populates="sources")
\ No newline at end of file
+    research = relationship("Research", back_populates="sources")
+    
+    __table_args__ = (
+        # Citation filters always run within a single research
+        Index("ix_sources_research_id_citation_count", research_id, citation_count),
+        # Lets a retried task re-save its sources without duplicating them
+        UniqueConstraint(research_id, url, name="uq_sources_research_id_url"),
+    )
\ No newline at end of file
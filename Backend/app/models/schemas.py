@@ -1,4 +1,4 @@
-from pydantic import BaseModel, Field, HttpUrl
+from pydantic import BaseModel, Field, HttpUrl, field_validator
 from typing import List, Optional, Dict, Any
 from datetime import datetime
 from enum import Enum
@@ -56,6 +56,16 @@ class ResearchRequest(BaseModel):
     min_citations: Optional[int] = Field(0, ge=0)
     sources: Optional[List[str]] = Field(None, description="List of sources: semantic_scholar, pubmed, arxiv, crossref")
 
+    @field_validator("source_types", mode="before")
+    @classmethod
+    def default_source_types(cls, v):
+        """Treat an empty or null source_types as academic search"""
+        return v or [SourceType.ACADEMIC]
+
+class ResearchBatchRequest(BaseModel):
+    """Request model for submitting several research queries at once"""
+    research: List[ResearchRequest] = Field(..., min_length=1, max_length=50)
+
 class ResearchUpdateRequest(BaseModel):
     """Request model for updating research status"""
     status: Optional[ResearchStatus] = None
@@ -128,12 +138,19 @@ class ResearchCreateResponse(BaseResponse):
     """Response when creating new research"""
     research: ResearchResponse
 
+class ResearchBatchCreateResponse(BaseResponse):
+    """Response when creating research in bulk"""
+    research_ids: List[int]
+    task_ids: List[str]
+
 class ResearchListResponse(BaseResponse):
     """Response for listing research"""
     research_list: List[ResearchSummary]
-    total: int
-    page: int
+    total: Optional[int] = None  # Estimated unless exact_count; omitted in cursor mode
+    page: Optional[int] = None  # Omitted in cursor mode
     page_size: int
+    next_cursor: Optional[str] = None
+    has_more: bool = False
 
 # Error response models
 class ErrorResponse(BaseModel):
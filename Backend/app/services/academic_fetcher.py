@@ -1,30 +1,160 @@
-import requests
+import asyncio
+import heapq
+import httpx
+import numpy as np
 import pandas as pd
+import threading
 import time
-from typing import List, Dict, Optional, Tuple
-from xml.etree import ElementTree as ET
+from cachetools import TTLCache
+from concurrent.futures import ThreadPoolExecutor
+from weakref import WeakKeyDictionary
+from typing import List, Dict, Optional, Tuple, Union
+from collections import Counter
+from lxml import etree
 from datetime import datetime
+import io
 import json
-from difflib import SequenceMatcher
+import logging
+import orjson
+from rapidfuzz import fuzz, process, utils
+from functools import lru_cache
+import hashlib
 import re
 
+from app.core.cache import cached_async
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+# Transient upstream failures worth retrying; other 4xx responses will not change on retry
+RETRY_STATUSES = {429, 500, 502, 503, 504}
+
+# Minimum rapidfuzz score (0-100) for two titles to count as the same paper
+TITLE_SIMILARITY_CUTOFF = 85
+
+# Sources whose records never carry a citation count (always 0)
+UNCITED_SOURCES = {"pubmed", "arxiv"}
+
+# Compiled once rather than on every dedup/export call
+PUNCT_RE = re.compile(r'[^\w\s]+')
+BIBTEX_KEY_RE = re.compile(r'\W+')
+
+# E-utilities endpoints; IDs are POSTed in batches to stay clear of URL length limits
+EUTILS_URL = "https://eutils.ncbi.nlm.nih.gov/entrez/eutils"
+PUBMED_BATCH_SIZE = 200
+
+# arXiv Atom feed lookups, compiled once instead of re-parsing path strings per entry.
+# Plain (not "smart") strings, so cached results do not keep the parsed tree alive.
+ATOM_NS = {'a': 'http://www.w3.org/2005/Atom', 'arx': 'http://arxiv.org/schemas/atom'}
+ARXIV_ENTRIES = etree.XPath('a:entry', namespaces=ATOM_NS)
+ARXIV_ID = etree.XPath('string(a:id)', namespaces=ATOM_NS, smart_strings=False)
+ARXIV_TITLE = etree.XPath('string(a:title)', namespaces=ATOM_NS, smart_strings=False)
+ARXIV_AUTHORS = etree.XPath('a:author/a:name/text()', namespaces=ATOM_NS, smart_strings=False)
+ARXIV_PUBLISHED = etree.XPath('string(a:published)', namespaces=ATOM_NS, smart_strings=False)
+ARXIV_SUMMARY = etree.XPath('string(a:summary)', namespaces=ATOM_NS, smart_strings=False)
+ARXIV_PDF = etree.XPath('a:link[@title="pdf"]/@href', namespaces=ATOM_NS, smart_strings=False)
+ARXIV_DOI = etree.XPath('arx:doi/text()', namespaces=ATOM_NS, smart_strings=False)
+
+
+def _papers_cache_key(fetcher, query: str, max_results: int = 20, date_from: str = None,
+                      min_citations: int = 0, selected_sources: List[str] = None) -> str:
+    """Redis key for fetch_papers_async results; source order does not matter"""
+    params = (
+        " ".join(query.lower().split()), max_results, date_from, min_citations or 0,
+        sorted(selected_sources) if selected_sources else None
+    )
+    return f"papers:{hashlib.sha1(orjson.dumps(params)).hexdigest()}"
+
+
 class EnhancedAcademicFetcher:
-    def __init__(self):
+    def __init__(self, cache_ttl_fresh: int = 120, cache_ttl_stale: int = 900):
         self.sources = {
             "semantic_scholar": self._fetch_semantic_scholar,
             "pubmed": self._fetch_pubmed,
             "arxiv": self._fetch_arxiv,
             "crossref": self._fetch_crossref,
         }
-        self.session = requests.Session()
-        self.session.headers.update({
+        self.headers = {
             'User-Agent': 'Academic-Fetcher/1.0[](https://example.com/contact)'
-        })
+        }
+        # One client per event loop, created lazily; an httpx client cannot be shared across loops
+        self._clients: "WeakKeyDictionary[asyncio.AbstractEventLoop, httpx.AsyncClient]" = WeakKeyDictionary()
+        # Per-source results keyed by (source, query, date_from, limit, min_citations) -> (fetched_at, papers).
+        # Fresh entries are served as is; stale ones are served while a background refresh runs.
+        # Repeats of the same search are answered by the Redis cache on fetch_papers_async
+        # before reaching this layer; it serves searches that differ in max_results or
+        # selected_sources yet ask a source the same thing, within one process.
+        self.cache_ttl_fresh = cache_ttl_fresh
+        self._cache = TTLCache(maxsize=256, ttl=cache_ttl_stale)
+        self._refreshing: Dict[tuple, Optional[asyncio.Task]] = {}  # None while a refresh is being started
+        # TTLCache is not thread-safe, and with the Celery threads pool each task's loop runs on its own thread
+        self._cache_lock = threading.Lock()
+
+    def _get_client(self) -> httpx.AsyncClient:
+        """Shared client for the current event loop so its connection pool is reused across sources"""
+        loop = asyncio.get_running_loop()
+        client = self._clients.get(loop)
+        if client is None:
+            # Connection failures are retried by the transport; status retries are in _fetch_with_retry
+            transport = httpx.AsyncHTTPTransport(
+                retries=3,
+                limits=httpx.Limits(max_connections=16, max_keepalive_connections=8)
+            )
+            client = httpx.AsyncClient(
+                headers=self.headers, timeout=10.0, follow_redirects=True, transport=transport
+            )
+            self._clients[loop] = client
+        return client
+
+    async def aclose(self):
+        """Finish this loop's background refreshes, then close its shared HTTP client"""
+        loop = asyncio.get_running_loop()
+        with self._cache_lock:
+            refreshes = [task for task in self._refreshing.values()
+                         if task is not None and task.get_loop() is loop]
+        if refreshes:
+            # Awaited rather than left running: the client they use is closed next, and
+            # asyncio.run would cancel them on exit anyway. Failures are logged by _refresh_done.
+            await asyncio.gather(*refreshes, return_exceptions=True)
+        client = self._clients.pop(loop, None)
+        if client is not None:
+            await client.aclose()
+
+    async def __aenter__(self) -> "EnhancedAcademicFetcher":
+        return self
+
+    async def __aexit__(self, *exc_info) -> None:
+        await self.aclose()
 
     def fetch_papers(self, query: str, max_results: int = 20, date_from: str = None, 
-                    min_citations: int = 0, selected_sources: List[str] = None) -> pd.DataFrame:
+                    min_citations: int = 0, selected_sources: List[str] = None) -> List[Dict]:
+        """Blocking wrapper around fetch_papers_async for synchronous callers."""
+        async def run():
+            try:
+                return await self.fetch_papers_async(query, max_results, date_from, min_citations, selected_sources)
+            finally:
+                await self.aclose()
+        
+        try:
+            asyncio.get_running_loop()
+        except RuntimeError:
+            return asyncio.run(run())
+        
+        # Called from code already running inside an event loop, where asyncio.run refuses
+        # to start: run the fetch on its own loop in a worker thread instead
+        with ThreadPoolExecutor(max_workers=1) as executor:
+            return executor.submit(asyncio.run, run()).result()
+
+    # Shared through Redis so repeat searches from any worker skip every upstream API;
+    # empty results (often every source failing) are not cached
+    @cached_async(settings.papers_cache_ttl, key_fn=_papers_cache_key, cache_if=bool)
+    async def fetch_papers_async(self, query: str, max_results: int = 20, date_from: str = None, 
+                                 min_citations: int = 0, selected_sources: List[str] = None) -> List[Dict]:
         """
-        Fetch papers from multiple sources and return as a pandas DataFrame.
+        Fetch papers from multiple sources concurrently.
+        
+        Results stay plain dicts; the DataFrame helpers below (filter, export,
+        report, display) accept this list directly.
         
         Args:
             query: Search query string
@@ -34,102 +164,236 @@ class EnhancedAcademicFetcher:
             selected_sources: List of sources to use (default: all)
             
         Returns:
-            DataFrame with paper information
+            List of paper dicts, most-cited first
         """
         results = []
         sources_to_use = selected_sources or list(self.sources.keys())
         per_source_limit = max(1, max_results // len(sources_to_use)) + 5  # Fetch extra for deduplication
         
-        print(f"🔍 Searching for '{query}' across {len(sources_to_use)} sources...")
+        logger.info("Searching for %r across %d sources", query, len(sources_to_use))
+        
+        sources_to_use = [source for source in sources_to_use if source in self.sources]
+        if min_citations > 0:
+            # Every paper from these would fail the citation filter below
+            sources_to_use = [source for source in sources_to_use if source not in UNCITED_SOURCES]
         
-        for source in sources_to_use:
-            fetch_func = self.sources.get(source)
-            if fetch_func:
-                print(f"  📚 Fetching from {source}...", end='', flush=True)
-                try:
-                    source_results = fetch_func(query, per_source_limit, date_from, min_citations)
-                    results.extend(source_results)
-                    print(f" ✓ ({len(source_results)} papers)")
-                except Exception as e:
-                    print(f" ✗ (Error: {str(e)})")
+        # All sources are requested at once, so the wait is the slowest source rather than the sum
+        tasks = {
+            asyncio.create_task(self._cached_fetch(source, query, per_source_limit, date_from, min_citations)): source
+            for source in sources_to_use
+        }
+        top_citations: List[int] = []  # Min-heap of the best max_results counts, one per distinct title
+        seen_titles = set()
+        pending = set(tasks)
+        while pending:
+            done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+            for task in done:
+                source = tasks[task]
+                if task.exception() is not None:
+                    logger.warning("%s fetch failed: %s", source, task.exception())
+                    continue
+                source_result = task.result()
+                results.extend(source_result)
+                logger.info("%s returned %d papers", source, len(source_result))
+                
+                for paper in source_result:
+                    title = PUNCT_RE.sub('', (paper.get('title') or '').lower()).strip()
+                    if title in seen_titles:
+                        continue
+                    seen_titles.add(title)
+                    if len(top_citations) < max_results:
+                        heapq.heappush(top_citations, paper.get('citation_count') or 0)
+                    else:
+                        heapq.heappushpop(top_citations, paper.get('citation_count') or 0)
+            
+            # Once the top max_results are all cited, papers from sources without citation
+            # counts would rank below all of them, so stop waiting on those sources. The title
+            # heap is a cheap precondition; DOI, fuzzy-title and PDF dedup can still merge its
+            # entries, so the real selection has to confirm it before anything is cancelled.
+            # This is an approximation: see _top_cited_full for how they could still matter.
+            uncited = {task for task in pending if tasks[task] in UNCITED_SOURCES}
+            if (uncited and len(top_citations) == max_results and top_citations[0] > 0
+                    and self._top_cited_full(results, max_results, min_citations)):
+                for task in uncited:
+                    task.cancel()
+                    logger.info("Cancelled %s; top %d papers already filled", tasks[task], max_results)
+                pending -= uncited
         
-        # Convert to DataFrame for easier manipulation
-        df = pd.DataFrame(results)
+        if not results:
+            logger.info("No results found for %r", query)
+            return []
         
-        if df.empty:
-            print("❌ No results found.")
-            return df
+        papers = self._select_papers(results, max_results, min_citations)
         
+        # Add additional computed fields
+        title_counts = Counter(p['normalized_title'] for p in papers)
+        for paper in papers:
+            paper['year'] = _to_year(paper.get('year'))
+            paper['has_pdf'] = paper.get('pdf_url') is not None
+            paper['source_count'] = title_counts[paper['normalized_title']]
+        
+        logger.info("Found %d unique papers after deduplication and filtering", len(papers))
+        
+        return papers
+    
+    def _select_papers(self, results: List[Dict], max_results: int, min_citations: int = 0) -> List[Dict]:
+        """Deduplicated papers passing the citation filter, top max_results by citations."""
         # Enhanced deduplication
-        df = self._deduplicate_papers(df)
+        papers = self._deduplicate_papers(results)
+        
+        # The same PDF is often listed by several sources under differing titles/DOIs
+        seen_pdfs = set()
+        unique_papers = []
+        for paper in papers:
+            pdf_url = paper.get('pdf_url')
+            if pdf_url:
+                if pdf_url in seen_pdfs:
+                    continue
+                seen_pdfs.add(pdf_url)
+            unique_papers.append(paper)
         
         # Filter by citations
         if min_citations > 0:
-            df = df[df['citation_count'] >= min_citations]
+            unique_papers = [p for p in unique_papers if p['citation_count'] >= min_citations]
         
-        # Sort by citation count
-        df = df.sort_values('citation_count', ascending=False).head(max_results)
-        
-        # Add additional computed fields
-        df['year'] = pd.to_numeric(df['year'], errors='coerce')
-        df['has_pdf'] = df['pdf_url'].notna()
-        df['source_count'] = df.groupby('normalized_title')['source'].transform('count')
+        # Top papers by citation count; a partial selection rather than a full sort
+        return heapq.nlargest(max_results, unique_papers, key=lambda p: p['citation_count'])
+    
+    def _top_cited_full(self, results: List[Dict], max_results: int, min_citations: int = 0) -> bool:
+        """Whether the final selection from `results` already has max_results papers, all cited.
         
-        print(f"\n✅ Found {len(df)} unique papers after deduplication and filtering.")
+        Uncited papers can no longer rank into such a selection, but they can still
+        change it through dedup: a no-DOI paper whose title matches a DOI paper is
+        dropped whatever the citation counts, so an uncited arXiv copy with a DOI
+        would replace a cited copy without one. Cancelling at this point skips that
+        case, so the result approximates waiting for every source.
+        """
+        papers = self._select_papers(results, max_results, min_citations)
+        return len(papers) == max_results and papers[-1]['citation_count'] > 0
+    
+    async def _cached_fetch(self, source: str, query: str, limit: int, date_from: str = None,
+                            min_citations: int = 0) -> List[Dict]:
+        """Fetch one source through the TTL cache with stale-while-revalidate."""
+        key = (source, query, date_from, limit, min_citations)
+        with self._cache_lock:
+            cached = self._cache.get(key)
+        if cached is None:
+            return await self._fetch_and_store(key)
         
-        return df.reset_index(drop=True)
+        fetched_at, papers = cached
+        with self._cache_lock:
+            # Claimed under the lock so concurrent loops start one refresh between them
+            refresh = time.monotonic() - fetched_at >= self.cache_ttl_fresh and key not in self._refreshing
+            if refresh:
+                self._refreshing[key] = None
+        if refresh:
+            task = asyncio.create_task(self._fetch_and_store(key))
+            task.add_done_callback(lambda t: self._refresh_done(key, t))
+            self._refreshing[key] = task
+        return papers
+    
+    async def _fetch_and_store(self, key: tuple) -> List[Dict]:
+        source, query, date_from, limit, min_citations = key
+        papers = await self.sources[source](query, limit, date_from, min_citations)
+        with self._cache_lock:
+            self._cache[key] = (time.monotonic(), papers)
+        return papers
     
-    def _deduplicate_papers(self, df: pd.DataFrame) -> pd.DataFrame:
+    def _refresh_done(self, key: tuple, task: asyncio.Task):
+        # A failed refresh just leaves the stale entry in place until it expires
+        with self._cache_lock:
+            self._refreshing.pop(key, None)
+        if not task.cancelled() and task.exception() is not None:
+            logger.warning("Background refresh of %s failed: %s", key[0], task.exception())
+    
+    def _deduplicate_papers(self, papers: List[Dict]) -> List[Dict]:
         """Enhanced deduplication using DOI and fuzzy title matching."""
-        # Normalize titles for comparison
-        df['normalized_title'] = df['title'].str.lower().str.replace(r'[^\w\s]', '', regex=True)
+        # Copies, since the source lists are shared with the response cache; normalized
+        # titles and counts are filled in here. Most-cited first, so the first copy of
+        # any duplicate is the one kept.
+        papers = sorted(
+            ({**paper,
+              'citation_count': paper.get('citation_count') or 0,
+              'normalized_title': PUNCT_RE.sub('', (paper.get('title') or '').lower()).strip()}
+             for paper in papers),
+            key=lambda p: p['citation_count'], reverse=True
+        )
         
         # First, deduplicate by DOI
-        doi_mask = df['doi'].notna()
-        unique_dois = df[doi_mask].drop_duplicates(subset=['doi'])
-        no_doi = df[~doi_mask]
-        
-        # Then, deduplicate remaining papers by fuzzy title matching
-        deduped = [unique_dois]
-        seen_titles = set(unique_dois['normalized_title'].values)
-        
-        for _, paper in no_doi.iterrows():
-            is_duplicate = False
-            for seen_title in seen_titles:
-                if self._similar_titles(paper['normalized_title'], seen_title):
-                    is_duplicate = True
-                    break
-            
-            if not is_duplicate:
-                deduped.append(pd.DataFrame([paper]))
+        unique_dois = {}
+        for paper in papers:
+            if paper.get('doi'):
+                unique_dois.setdefault(paper['doi'], paper)
+        unique_dois = list(unique_dois.values())
+        
+        # Exact title repeats are dropped via a set, leaving only the residue for fuzzy matching
+        seen_titles = {paper['normalized_title'] for paper in unique_dois}
+        no_doi = []
+        for paper in papers:
+            if not paper.get('doi') and paper['normalized_title'] not in seen_titles:
                 seen_titles.add(paper['normalized_title'])
+                no_doi.append(paper)
+        
+        if not no_doi:
+            return unique_dois
         
-        return pd.concat(deduped, ignore_index=True) if deduped else pd.DataFrame()
+        # Then, deduplicate remaining papers by fuzzy title matching. Both similarity
+        # matrices are computed in bulk by rapidfuzz instead of pairwise in Python.
+        candidates = [paper['normalized_title'] for paper in no_doi]
+        keep = np.ones(len(candidates), dtype=bool)
+        
+        if unique_dois:
+            doi_titles = [paper['normalized_title'] for paper in unique_dois]
+            keep &= ~self._similar_titles(candidates, doi_titles).any(axis=1)
+        
+        # A paper is dropped if it matches an earlier no-DOI paper that was itself kept
+        similar = self._similar_titles(candidates, candidates)
+        for i in range(1, len(candidates)):
+            if keep[i] and (similar[i, :i] & keep[:i]).any():
+                keep[i] = False
+        
+        return unique_dois + [paper for paper, kept in zip(no_doi, keep) if kept]
     
-    def _similar_titles(self, title1: str, title2: str, threshold: float = 0.85) -> bool:
-        """Check if two titles are similar using sequence matching."""
-        return SequenceMatcher(None, title1, title2).ratio() > threshold
+    def _similar_titles(self, titles: List[str], other_titles: List[str]) -> np.ndarray:
+        """Boolean matrix of which titles match which other titles (word order ignored)."""
+        scores = process.cdist(
+            titles, other_titles,
+            scorer=fuzz.token_sort_ratio,
+            processor=utils.default_process,
+            score_cutoff=TITLE_SIMILARITY_CUTOFF,
+            dtype=np.uint8,
+            workers=-1
+        )
+        return scores >= TITLE_SIMILARITY_CUTOFF
     
-    def _fetch_with_retry(self, url: str, params: dict, max_retries: int = 3) -> requests.Response:
-        """Fetch URL with exponential backoff retry."""
+    async def _fetch_with_retry(self, url: str, params: dict = None, max_retries: int = 3,
+                                backoff_factor: float = 0.5, data: dict = None) -> httpx.Response:
+        """Fetch URL (POST when form data is given) with exponential backoff retry on timeouts and transient status codes."""
+        client = self._get_client()
         for attempt in range(max_retries):
             try:
-                response = self.session.get(url, params=params, timeout=10)
+                if data is not None:
+                    response = await client.post(url, params=params, data=data)
+                else:
+                    response = await client.get(url, params=params)
                 response.raise_for_status()
                 return response
-            except requests.exceptions.RequestException as e:
+            except httpx.HTTPStatusError as e:
+                if e.response.status_code not in RETRY_STATUSES or attempt == max_retries - 1:
+                    raise
+            except httpx.TransportError:
                 if attempt == max_retries - 1:
                     raise
-                time.sleep(2 ** attempt)
+            await asyncio.sleep(backoff_factor * 2 ** attempt)
     
-    def filter_papers(self, df: pd.DataFrame, year_range: Tuple[int, int] = None,
+    def filter_papers(self, papers: Union[pd.DataFrame, List[Dict]], year_range: Tuple[int, int] = None,
                      venues: List[str] = None, min_citations: int = None,
                      has_pdf: bool = None) -> pd.DataFrame:
         """
         Filter papers DataFrame by various criteria.
         
         Args:
-            df: Papers DataFrame
+            papers: Papers DataFrame or list from fetch_papers
             year_range: Tuple of (start_year, end_year)
             venues: List of venue names to include
             min_citations: Minimum citation count
@@ -138,36 +402,48 @@ class EnhancedAcademicFetcher:
         Returns:
             Filtered DataFrame
         """
-        filtered = df.copy()
+        df = _as_frame(papers)
+        
+        # Predicates are ANDed into one mask so only the final frame is materialized
+        mask = np.ones(len(df), dtype=bool)
         
         if year_range:
-            filtered = filtered[(filtered['year'] >= year_range[0]) & 
-                              (filtered['year'] <= year_range[1])]
+            mask &= df['year'].between(*year_range).to_numpy()
         
         if venues:
-            filtered = filtered[filtered['venue'].isin(venues)]
+            mask &= df['venue'].isin(venues).to_numpy()
         
         if min_citations is not None:
-            filtered = filtered[filtered['citation_count'] >= min_citations]
+            mask &= (df['citation_count'] >= min_citations).to_numpy()
         
         if has_pdf is not None:
-            filtered = filtered[filtered['has_pdf'] == has_pdf]
+            mask &= (df['has_pdf'] == has_pdf).to_numpy()
         
-        return filtered
+        return df.loc[mask]
     
-    def export_results(self, df: pd.DataFrame, filename: str, format: str = 'csv'):
+    def export_results(self, papers: Union[pd.DataFrame, List[Dict]], filename: str, format: str = 'csv'):
         """
         Export results to file.
         
         Args:
-            df: Papers DataFrame
+            papers: Papers DataFrame or list from fetch_papers
             filename: Output filename
-            format: Export format ('csv', 'json', 'excel', 'bibtex')
+            format: Export format ('csv', 'json', 'excel', 'parquet', 'bibtex')
         """
+        if format == 'json':
+            # orjson writes the records directly; a list from fetch_papers skips pandas entirely
+            records = papers.to_dict('records') if isinstance(papers, pd.DataFrame) else papers
+            with open(filename, 'wb') as f:
+                f.write(orjson.dumps(records, option=orjson.OPT_INDENT_2 | orjson.OPT_SERIALIZE_NUMPY))
+            logger.info("Exported %d papers to %s", len(records), filename)
+            return
+        
+        df = _as_frame(papers)
         if format == 'csv':
-            df.to_csv(filename, index=False)
-        elif format == 'json':
-            df.to_json(filename, orient='records', indent=2)
+            df.to_csv(filename, index=False, chunksize=10_000)
+        elif format == 'parquet':
+            # Columnar and compressed; needs pyarrow installed
+            df.to_parquet(filename, engine='pyarrow', compression='zstd', index=False)
         elif format == 'excel':
             df.to_excel(filename, index=False, sheet_name='Papers')
         elif format == 'bibtex':
@@ -175,55 +451,70 @@ class EnhancedAcademicFetcher:
         else:
             raise ValueError(f"Unsupported format: {format}")
         
-        print(f"📁 Exported {len(df)} papers to {filename}")
+        logger.info("Exported %d papers to %s", len(df), filename)
     
     def _export_bibtex(self, df: pd.DataFrame, filename: str):
         """Export papers to BibTeX format."""
         entries = []
-        for _, paper in df.iterrows():
-            entry_type = "article" if paper.get('venue') else "misc"
-            key = re.sub(r'[^\w]', '', paper['title'][:20].lower()) + str(paper.get('year', ''))
-            
-            entry = f"@{entry_type}{{{key},\n"
-            entry += f"  title={{{paper['title']}}},\n"
-            
-            if paper.get('authors'):
-                authors = " and ".join(paper['authors'])
-                entry += f"  author={{{authors}}},\n"
-            
-            if paper.get('year'):
-                entry += f"  year={{{paper['year']}}},\n"
-            
-            if paper.get('venue'):
-                entry += f"  journal={{{paper['venue']}}},\n"
-            
-            if paper.get('doi'):
-                entry += f"  doi={{{paper['doi']}}},\n"
+        for paper in df.itertuples(index=False):
+            year = _bibtex_year(paper.year)
+            fields = [f"  title={{{paper.title}}}"]
             
-            if paper.get('pdf_url'):
-                entry += f"  url={{{paper['pdf_url']}}},\n"
+            if not _is_blank(paper.authors):
+                fields.append(f"  author={{{' and '.join(paper.authors)}}}")
+            if year:
+                fields.append(f"  year={{{year}}}")
+            if not _is_blank(paper.venue):
+                fields.append(f"  journal={{{paper.venue}}}")
+            if not _is_blank(paper.doi):
+                fields.append(f"  doi={{{paper.doi}}}")
+            if not _is_blank(paper.pdf_url):
+                fields.append(f"  url={{{paper.pdf_url}}}")
             
-            entry = entry.rstrip(',\n') + "\n}"
-            entries.append(entry)
+            entry_type = "misc" if _is_blank(paper.venue) else "article"
+            key = BIBTEX_KEY_RE.sub('', str(paper.title)[:20].lower()) + year
+            entries.append(f"@{entry_type}{{{key},\n" + ",\n".join(fields) + "\n}")
         
-        with open(filename, 'w', encoding='utf-8') as f:
+        with open(filename, 'w', encoding='utf-8', buffering=1 << 16) as f:
             f.write('\n\n'.join(entries))
     
-    def create_summary_report(self, df: pd.DataFrame) -> Dict:
-        """Generate a summary report of the fetched papers."""
+    def create_summary_report(self, papers: Union[pd.DataFrame, List[Dict]]) -> Dict:
+        """Generate a summary report of the fetched papers in a single pass."""
+        records = papers.to_dict('records') if isinstance(papers, pd.DataFrame) else papers
+        
+        source_counts, venue_counts = Counter(), Counter()
+        total_citations = papers_with_pdf = 0
+        min_year = max_year = None
+        for paper in records:
+            source_counts[paper.get('source')] += 1
+            if not _is_blank(paper.get('venue')):
+                venue_counts[paper['venue']] += 1
+            total_citations += paper.get('citation_count') or 0
+            papers_with_pdf += bool(paper.get('has_pdf'))
+            
+            year = paper.get('year')
+            if not _is_blank(year):
+                min_year = year if min_year is None else min(min_year, year)
+                max_year = year if max_year is None else max(max_year, year)
+        
+        top_cited = heapq.nlargest(5, records, key=lambda p: p.get('citation_count') or 0)
         report = {
-            'total_papers': len(df),
-            'date_range': f"{df['year'].min()}-{df['year'].max()}",
-            'sources': df['source'].value_counts().to_dict(),
-            'top_venues': df['venue'].value_counts().head(10).to_dict(),
-            'avg_citations': df['citation_count'].mean(),
-            'papers_with_pdf': df['has_pdf'].sum(),
-            'top_cited': df.nlargest(5, 'citation_count')[['title', 'citation_count', 'year']].to_dict('records')
+            'total_papers': len(records),
+            'date_range': f"{min_year}-{max_year}",
+            'sources': dict(source_counts.most_common()),
+            'top_venues': dict(venue_counts.most_common(10)),
+            'avg_citations': total_citations / len(records) if records else 0.0,
+            'papers_with_pdf': papers_with_pdf,
+            'top_cited': [
+                {'title': p.get('title'), 'citation_count': p.get('citation_count'), 'year': p.get('year')}
+                for p in top_cited
+            ]
         }
         return report
     
-    def display_papers(self, df: pd.DataFrame, max_display: int = 10):
+    def display_papers(self, papers: Union[pd.DataFrame, List[Dict]], max_display: int = 10):
         """Display papers in a formatted way."""
+        df = _as_frame(papers)
         print("\n📊 Paper Results:")
         print("=" * 100)
         
@@ -249,7 +540,7 @@ class EnhancedAcademicFetcher:
             print(f"\n... and {len(df) - max_display} more papers")
     
     # [Previous fetch methods remain the same, just add proper error handling]
-    def _fetch_semantic_scholar(self, query: str, limit: int, date_from: str = None, min_citations: int = 0) -> List[Dict]:
+    async def _fetch_semantic_scholar(self, query: str, limit: int, date_from: str = None, min_citations: int = 0) -> List[Dict]:
         url = "https://api.semanticscholar.org/graph/v1/paper/search"
         params = {
             "query": query,
@@ -258,60 +549,66 @@ class EnhancedAcademicFetcher:
         }
         if date_from:
             params["year"] = f"{date_from}-"
+        if min_citations > 0:
+            # Filtered by the API, so the limit is not spent on papers we would discard
+            params["minCitationCount"] = min_citations
         try:
-            response = self._fetch_with_retry(url, params).json()
+            response = orjson.loads((await self._fetch_with_retry(url, params)).content)
             papers = response.get("data", [])
-            return [
-                {
-                    "title": p["title"],
-                    "authors": [a["name"] for a in p.get("authors", [])],
-                    "year": p.get("year"),
-                    "venue": p.get("venue"),
-                    "abstract": p.get("abstract"),
-                    "pdf_url": p.get("openAccessPdf", {}).get("url") if p.get("openAccessPdf") else None,
-                    "citation_count": p.get("citationCount", 0),
-                    "source": "semantic_scholar",
-                    "doi": p.get("externalIds", {}).get("DOI"),
-                }
-                for p in papers if p.get("citationCount", 0) >= min_citations
-            ]
+            return [_semantic_scholar_paper(p) for p in papers]
         except Exception as e:
             raise Exception(f"Semantic Scholar API error: {e}")
     
-    def _fetch_pubmed(self, query: str, limit: int, date_from: str = None, min_citations: int = 0) -> List[Dict]:
-        esearch_url = "https://eutils.ncbi.nlm.nih.gov/entrez/eutils/esearch.fcgi"
+    async def _fetch_pubmed(self, query: str, limit: int, date_from: str = None, min_citations: int = 0) -> List[Dict]:
+        esearch_url = f"{EUTILS_URL}/esearch.fcgi"
         params = {"db": "pubmed", "term": query, "retmax": limit, "retmode": "json"}
         if date_from:
             params["datetype"] = "pdat"
             params["mindate"] = date_from
             params["maxdate"] = "3000"
         try:
-            response = self._fetch_with_retry(esearch_url, params).json()
+            response = orjson.loads((await self._fetch_with_retry(esearch_url, params)).content)
             ids = response.get("esearchresult", {}).get("idlist", [])
 
             if ids:
-                esummary_url = "https://eutils.ncbi.nlm.nih.gov/entrez/eutils/esummary.fcgi"
-                params = {"db": "pubmed", "id": ",".join(ids), "retmode": "json"}
-                summaries = self._fetch_with_retry(esummary_url, params).json().get("result", {})
+                # Summaries (in ID batches) and abstracts are independent, so all requests go out together
+                batches = [ids[i:i + PUBMED_BATCH_SIZE] for i in range(0, len(ids), PUBMED_BATCH_SIZE)]
+                *summary_batches, abstracts = await asyncio.gather(
+                    *(self._fetch_pubmed_summaries(batch) for batch in batches),
+                    self._fetch_pubmed_abstracts(ids)
+                )
+                summaries = {}
+                for batch in summary_batches:
+                    summaries.update(batch)
                 return [
-                    {
-                        "title": summaries[id].get("title"),
-                        "authors": [a["name"] for a in summaries[id].get("authors", [])],
-                        "year": summaries[id].get("pubdate", "")[:4],
-                        "venue": summaries[id].get("source"),
-                        "abstract": "",
-                        "pdf_url": None,
-                        "citation_count": 0,
-                        "source": "pubmed",
-                        "doi": summaries[id].get("elocationid", "").replace("doi: ", "") if "doi" in summaries[id].get("elocationid", "") else None,
-                    }
+                    _pubmed_paper(summaries[id], abstracts.get(id, ""))
                     for id in ids if id in summaries
                 ]
             return []
         except Exception as e:
             raise Exception(f"PubMed API error: {e}")
 
-    def _fetch_arxiv(self, query: str, limit: int, date_from: str = None, min_citations: int = 0) -> List[Dict]:
+    async def _fetch_pubmed_summaries(self, ids: List[str]) -> Dict:
+        data = {"db": "pubmed", "id": ",".join(ids), "retmode": "json"}
+        response = await self._fetch_with_retry(f"{EUTILS_URL}/esummary.fcgi", data=data)
+        return orjson.loads(response.content).get("result", {})
+
+    async def _fetch_pubmed_abstracts(self, ids: List[str]) -> Dict[str, str]:
+        """Abstracts by PMID from a single EFetch call, which ESummary does not return."""
+        data = {"db": "pubmed", "id": ",".join(ids), "rettype": "abstract", "retmode": "xml"}
+        response = await self._fetch_with_retry(f"{EUTILS_URL}/efetch.fcgi", data=data)
+        
+        abstracts = {}
+        for _, article in etree.iterparse(io.BytesIO(response.content), tag="PubmedArticle"):
+            pmid = article.findtext("MedlineCitation/PMID")
+            # Structured abstracts are split into labelled AbstractText sections
+            sections = ("".join(t.itertext()).strip()
+                        for t in article.iterfind("MedlineCitation/Article/Abstract/AbstractText"))
+            abstracts[pmid] = " ".join(section for section in sections if section)
+            article.clear()
+        return abstracts
+
+    async def _fetch_arxiv(self, query: str, limit: int, date_from: str = None, min_citations: int = 0) -> List[Dict]:
         url = "http://export.arxiv.org/api/query"
         params = {
             "search_query": f"all:{query}",
@@ -323,62 +620,146 @@ class EnhancedAcademicFetcher:
         if date_from:
             params["search_query"] += f" AND submittedDate:[{date_from}000000 TO *]"
         try:
-            response = self._fetch_with_retry(url, params).text
-            root = ET.fromstring(response)
-            entries = root.findall("{http://www.w3.org/2005/Atom}entry")
-            return [
-                {
-                    "title": e.find("{http://www.w3.org/2005/Atom}title").text.strip(),
-                    "authors": [a.text for a in e.findall("{http://www.w3.org/2005/Atom}author/{http://www.w3.org/2005/Atom}name")],
-                    "year": e.find("{http://www.w3.org/2005/Atom}published").text[:4],
-                    "venue": "arXiv",
-                    "abstract": e.find("{http://www.w3.org/2005/Atom}summary").text.strip(),
-                    "pdf_url": next((l.get("href") for l in e.findall("{http://www.w3.org/2005/Atom}link") 
-                                   if l.get("title") == "pdf"), None),
-                    "citation_count": 0,
-                    "source": "arxiv",
-                    "doi": e.find("{http://arxiv.org/schemas/atom}doi").text if e.find("{http://arxiv.org/schemas/atom}doi") is not None else None,
-                }
-                for e in entries
-            ]
+            # Parsed from the raw bytes by libxml2; lxml honours the XML encoding declaration itself
+            root = etree.fromstring((await self._fetch_with_retry(url, params)).content)
+            return [_arxiv_paper(e) for e in ARXIV_ENTRIES(root)]
         except Exception as e:
             raise Exception(f"arXiv API error: {e}")
 
-    def _fetch_crossref(self, query: str, limit: int, date_from: str = None, min_citations: int = 0) -> List[Dict]:
+    async def _fetch_crossref(self, query: str, limit: int, date_from: str = None, min_citations: int = 0) -> List[Dict]:
         url = "https://api.crossref.org/works"
         params = {"query": query, "rows": limit}
         if date_from:
-            params["from-pub-date"] = date_from
+            # CrossRef only applies date bounds given through the filter parameter
+            params["filter"] = f"from-pub-date:{date_from}"
         try:
-            response = self._fetch_with_retry(url, params).json()
+            response = orjson.loads((await self._fetch_with_retry(url, params)).content)
             items = response.get("message", {}).get("items", [])
+            # CrossRef has no citation-count filter, so this one stays client-side
             return [
-                {
-                    "title": i.get("title", [""])[0],
-                    "authors": [f"{a.get('family', '')} {a.get('given', '')}".strip() 
-                              for a in i.get("author", [])],
-                    "year": i.get("published-print", i.get("published-online", {})).get("date-parts", [[None]])[0][0],
-                    "venue": i.get("container-title", [""])[0] if i.get("container-title") else None,
-                    "abstract": i.get("abstract", ""),
-                    "pdf_url": next((link.get("URL") for link in i.get("link", []) 
-                                   if link.get("content-type") == "application/pdf"), None),
-                    "citation_count": i.get("is-referenced-by-count", 0),
-                    "source": "crossref",
-                    "doi": i.get("DOI"),
-                }
-                for i in items if i.get("is-referenced-by-count", 0) >= min_citations
+                _crossref_paper(i) for i in items
+                if (i.get("is-referenced-by-count") or 0) >= min_citations
             ]
         except Exception as e:
             raise Exception(f"CrossRef API error: {e}")
 
 
+# Record projections for each source API. Nested objects are looked up once per
+# record, and `or` defaults also cover keys that are present but null. "url" is the
+# record's own page, built from the API's id, so every paper has a distinct link.
+def _semantic_scholar_paper(p: Dict) -> Dict:
+    open_access = p.get("openAccessPdf") or {}
+    external_ids = p.get("externalIds") or {}
+    return {
+        "title": p["title"],
+        "authors": [a["name"] for a in p.get("authors") or ()],
+        "year": p.get("year"),
+        "venue": p.get("venue"),
+        "abstract": p.get("abstract"),
+        "pdf_url": open_access.get("url"),
+        "citation_count": p.get("citationCount") or 0,
+        "source": "semantic_scholar",
+        "doi": external_ids.get("DOI"),
+        "url": f"https://www.semanticscholar.org/paper/{p['paperId']}",
+    }
+
+
+def _arxiv_paper(e) -> Dict:
+    pdf_urls = ARXIV_PDF(e)
+    dois = ARXIV_DOI(e)
+    return {
+        "title": ARXIV_TITLE(e).strip(),
+        "authors": ARXIV_AUTHORS(e),
+        "year": ARXIV_PUBLISHED(e)[:4],
+        "venue": "arXiv",
+        "abstract": ARXIV_SUMMARY(e).strip(),
+        "pdf_url": pdf_urls[0] if pdf_urls else None,
+        "citation_count": 0,
+        "source": "arxiv",
+        "doi": dois[0] if dois else None,
+        "url": ARXIV_ID(e).strip(),
+    }
+
+
+def _pubmed_paper(summary: Dict, abstract: str) -> Dict:
+    elocation_id = summary.get("elocationid") or ""
+    return {
+        "title": summary.get("title"),
+        "authors": [a["name"] for a in summary.get("authors") or ()],
+        "year": (summary.get("pubdate") or "")[:4],
+        "venue": summary.get("source"),
+        "abstract": abstract,
+        "pdf_url": None,
+        "citation_count": 0,
+        "source": "pubmed",
+        "doi": elocation_id.replace("doi: ", "") if "doi" in elocation_id else None,
+        "url": f"https://pubmed.ncbi.nlm.nih.gov/{summary['uid']}/",
+    }
+
+
+def _crossref_paper(i: Dict) -> Dict:
+    published = i.get("published-print") or i.get("published-online") or {}
+    container_title = i.get("container-title")
+    return {
+        "title": (i.get("title") or [""])[0],
+        "authors": [f"{a.get('family', '')} {a.get('given', '')}".strip() for a in i.get("author") or ()],
+        "year": (published.get("date-parts") or [[None]])[0][0],
+        "venue": container_title[0] if container_title else None,
+        "abstract": i.get("abstract", ""),
+        "pdf_url": next((link.get("URL") for link in i.get("link") or ()
+                         if link.get("content-type") == "application/pdf"), None),
+        "citation_count": i.get("is-referenced-by-count") or 0,
+        "source": "crossref",
+        "doi": i.get("DOI"),
+        "url": i.get("URL"),
+    }
+
+
+def _as_frame(papers: Union[pd.DataFrame, List[Dict]]) -> pd.DataFrame:
+    """DataFrame for the tabular helpers; fetch_papers itself returns a list of dicts."""
+    return papers if isinstance(papers, pd.DataFrame) else pd.DataFrame(papers)
+
+
+def _to_year(value) -> Optional[int]:
+    """Publication year as an int, or None when missing or unparseable."""
+    try:
+        return int(str(value)[:4])
+    except (TypeError, ValueError):
+        return None
+
+
+def _is_blank(value) -> bool:
+    """True for None, NaN and empty strings/lists, which sparse DataFrame columns are full of."""
+    if isinstance(value, (list, tuple)):
+        return not value
+    return value is None or value != value or value == ''
+
+
+def _bibtex_year(year) -> str:
+    """Year as written in BibTeX; to_numeric leaves it as a float like 2020.0."""
+    if _is_blank(year):
+        return ''
+    try:
+        return str(int(float(year)))
+    except ValueError:
+        return str(year)
+
+
+@lru_cache(maxsize=1)
+def get_fetcher() -> EnhancedAcademicFetcher:
+    """Process-wide fetcher so its HTTP client and connection pool are reused"""
+    return EnhancedAcademicFetcher()
+
+
 # Example usage with enhanced features
 if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO, format="%(message)s")
+    
     # Initialize fetcher
     fetcher = EnhancedAcademicFetcher()
     
     # Fetch papers
-    papers_df = fetcher.fetch_papers(
+    papers = fetcher.fetch_papers(
         query="transformer neural networks",
         max_results=30,
         date_from="2020",
@@ -386,18 +767,18 @@ if __name__ == "__main__":
     )
     
     # Display results
-    fetcher.display_papers(papers_df)
+    fetcher.display_papers(papers)
     
     # Generate and print summary report
-    report = fetcher.create_summary_report(papers_df)
+    report = fetcher.create_summary_report(papers)
     print("\n📈 Summary Report:")
     print(json.dumps(report, indent=2))
     
     # Filter papers from specific venues
     top_venues = ['Nature', 'Science', 'NeurIPS', 'ICML', 'arXiv']
-    filtered_df = fetcher.filter_papers(papers_df, venues=top_venues, has_pdf=True)
+    filtered_df = fetcher.filter_papers(papers, venues=top_venues, has_pdf=True)
     
     # Export results
-    fetcher.export_results(papers_df, "papers.csv", format="csv")
+    fetcher.export_results(papers, "papers.csv", format="csv")
     fetcher.export_results(filtered_df, "top_papers.json", format="json")
-    fetcher.export_results(papers_df.head(10), "references.bib", format="bibtex")
\ No newline at end of file
+    fetcher.export_results(papers[:10], "references.bib", format="bibtex")
\ No newline at end of file
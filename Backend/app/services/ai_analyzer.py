@@ -1,27 +1,159 @@
-from typing import List, Dict, Optional, Protocol
+from typing import AsyncIterator, List, Dict, Optional, Protocol, Tuple, TypedDict
 from abc import ABC, abstractmethod
 import os
 from dotenv import load_dotenv
 import logging
-import json
 import asyncio
+from functools import lru_cache
+import hashlib
+import io
+import orjson
 
 # AI Provider imports
 import openai
 import google.generativeai as genai
+from google.api_core import exceptions as google_exceptions
+import groq
 from groq import AsyncGroq  # Use async client for Groq
 
+from app.services.llm_cache import LLMCache, llm_cache
+from app.services.ratelimit import get_bucket, provider_concurrency, with_retry
+
 load_dotenv()
 logger = logging.getLogger(__name__)
 
+# Transient provider errors worth retrying; anything else goes straight to the fallback analysis
+OPENAI_RETRYABLE = (openai.RateLimitError, openai.APITimeoutError)
+GROQ_RETRYABLE = (groq.RateLimitError, groq.APITimeoutError)
+GEMINI_RETRYABLE = (google_exceptions.ResourceExhausted, google_exceptions.DeadlineExceeded,
+                    google_exceptions.ServiceUnavailable)
+
+def _dedupe_contents(contents: List[Dict], limit: int = 5) -> List[Dict]:
+    """First `limit` sources with distinct opening text; syndicated copies of a page would only burn prompt tokens"""
+    seen = set()
+    unique = []
+    for content in contents:
+        text = content.get('content') or ''
+        if text:
+            digest = hashlib.sha1(text[:512].encode()).digest()
+            if digest in seen:
+                continue
+            seen.add(digest)
+        unique.append(content)
+        if len(unique) == limit:
+            break
+    return unique
+
+def _snippet(content: Dict, length: int) -> str:
+    """Source text for a prompt, using the slice ContentProcessor already cut when present"""
+    return (content.get('prompt_snippet') or content.get('content') or '')[:length]
+
+class AnalysisResult(TypedDict):
+    """Structured-output schema for Gemini analyses"""
+    summary: str
+    key_findings: List[str]
+    themes: List[str]
+    contradictions: List[str]
+    recommendations: List[str]
+
+# Applied per analysis call only; refine_query and recommendations expect plain text
+GEMINI_ANALYSIS_CONFIG = genai.GenerationConfig(
+    response_mime_type="application/json",
+    response_schema=AnalysisResult
+)
+
+def _extract_json(text: str) -> Optional[str]:
+    """First balanced {...} object in text, found in one pass (braces inside strings are skipped)"""
+    start = text.find('{')
+    if start < 0:
+        return None
+    depth = 0
+    in_string = escaped = False
+    for i in range(start, len(text)):
+        char = text[i]
+        if in_string:
+            if escaped:
+                escaped = False
+            elif char == '\\':
+                escaped = True
+            elif char == '"':
+                in_string = False
+        elif char == '"':
+            in_string = True
+        elif char == '{':
+            depth += 1
+        elif char == '}':
+            depth -= 1
+            if depth == 0:
+                return text[start:i + 1]
+    return None
+
+def _close_partial_json(text: str) -> str:
+    """Best-effort completion of a truncated JSON document (open strings, arrays and
+    objects are closed) so a streamed response can be parsed before it finishes"""
+    closers = []
+    in_string = escaped = False
+    for char in text:
+        if in_string:
+            if escaped:
+                escaped = False
+            elif char == '\\':
+                escaped = True
+            elif char == '"':
+                in_string = False
+        elif char == '"':
+            in_string = True
+        elif char == '{':
+            closers.append('}')
+        elif char == '[':
+            closers.append(']')
+        elif char in '}]' and closers:
+            closers.pop()
+    
+    if in_string:
+        text = (text[:-1] if escaped else text) + '"'
+    text = text.rstrip()
+    if text.endswith(','):
+        text = text[:-1]
+    elif text.endswith(':'):
+        text += 'null'
+    return text + ''.join(reversed(closers))
+
+async def _stream_json_completion(create, request: Dict) -> AsyncIterator[Dict]:
+    """Stream an OpenAI-compatible chat completion, yielding the JSON object parsed so far whenever it grows"""
+    stream = await create(**request, stream=True)
+    buffer = io.StringIO()
+    last = None
+    async for chunk in stream:
+        delta = chunk.choices[0].delta.content if chunk.choices else None
+        if not delta:
+            continue
+        buffer.write(delta)
+        try:
+            partial = orjson.loads(_close_partial_json(buffer.getvalue()))
+        except orjson.JSONDecodeError:
+            continue  # e.g. cut off inside an object key
+        if isinstance(partial, dict) and partial != last:
+            last = partial
+            yield partial
+    
+    final = orjson.loads(buffer.getvalue())
+    if final != last:
+        yield final
+
 class AIProvider(ABC):
     """Abstract base class for AI providers"""
     
     @abstractmethod
-    async def analyze_content(self, query: str, contents: List[Dict]) -> Dict:
+    async def analyze_content(self, query: str, contents: List[Dict], max_findings: int = 5) -> Dict:
         """Analyze scraped content and return insights"""
         pass
     
+    async def stream_content(self, query: str, contents: List[Dict], max_findings: int = 5) -> AsyncIterator[Dict]:
+        """Yield the analysis as it is generated, the complete result last.
+        Providers without streaming support yield it once."""
+        yield await self.analyze_content(query, contents, max_findings)
+    
     @abstractmethod
     def is_configured(self) -> bool:
         """Check if provider is properly configured"""
@@ -42,28 +174,35 @@ class OpenAIProvider(AIProvider):
         self.api_key = os.getenv("OPENAI_API_KEY")
         self.client = None
         if self.api_key:
-            self.client = openai.AsyncOpenAI(api_key=self.api_key)  # Use async client
+            # Retries are handled by _create so they share the rate limiter
+            self.client = openai.AsyncOpenAI(api_key=self.api_key, max_retries=0)  # Use async client
         self.model = "gpt-4-turbo-preview"  # or "gpt-3.5-turbo" for cheaper
+        self.bucket = get_bucket("openai", self.model)
     
     def is_configured(self) -> bool:
         return bool(self.api_key)
     
-    async def analyze_content(self, query: str, contents: List[Dict]) -> Dict:
-        try:
-            # Prepare content for analysis
-            source_texts = []
-            for idx, content in enumerate(contents[:5]):  # Limit to 5 sources
-                source_texts.append(f"""
+    @with_retry(OPENAI_RETRYABLE)
+    async def _create(self, **request):
+        await self.bucket.acquire()
+        return await self.client.chat.completions.create(**request)
+    
+    def _analysis_request(self, query: str, contents: List[Dict], max_findings: int = 5) -> Dict:
+        """Chat completion parameters for an analysis; shared by single and batch requests"""
+        # Prepare content for analysis
+        source_texts = []
+        for idx, content in enumerate(_dedupe_contents(contents)):  # Limit to 5 sources
+            source_texts.append(f"""
 Source {idx + 1}: {content.get('title', 'Unknown')}
 URL: {content.get('url', '')}
-Content: {content.get('content', '')[:2000]}  # Limit content length
+Content: {_snippet(content, 2000)}
 ---""")
-            
-            prompt = f"""
+        
+        prompt = f"""
 You are an expert research analyst. Analyze the following sources about "{query}" and provide:
 
 1. A comprehensive summary (2-3 paragraphs)
-2. Key findings (5-7 bullet points)
+2. Key findings (exactly {max_findings} bullet points)
 3. Common themes across sources
 4. Any contradictions or debates
 5. Actionable insights or recommendations
@@ -73,57 +212,118 @@ Sources:
 
 Provide your analysis in JSON format with keys: summary, key_findings, themes, contradictions, recommendations.
 """
-            
+        return {
+            "model": self.model,
+            "messages": [
+                {"role": "system", "content": "You are a research analyst providing structured analysis."},
+                {"role": "user", "content": prompt}
+            ],
+            "response_format": {"type": "json_object"},
+            "temperature": 0.7,
+            "max_tokens": 2000
+        }
+    
+    async def analyze_content(self, query: str, contents: List[Dict], max_findings: int = 5) -> Dict:
+        try:
             if not self.client:
                 raise ValueError("OpenAI client not initialized")
             
-            response = await self.client.chat.completions.create(
-                model=self.model,
-                messages=[
-                    {"role": "system", "content": "You are a research analyst providing structured analysis."},
-                    {"role": "user", "content": prompt}
-                ],
-                response_format={"type": "json_object"},
-                temperature=0.7,
-                max_tokens=2000
-            )
+            response = await self._create(**self._analysis_request(query, contents, max_findings))
             
-            result = json.loads(response.choices[0].message.content)
-            logger.info(f"OpenAI analysis completed for query: {query}")
+            result = orjson.loads(response.choices[0].message.content)
+            logger.info("OpenAI analysis completed for query: %s", query)
             return result
             
-        except Exception as e:
-            logger.error(f"OpenAI analysis failed: {str(e)}")
+        except Exception:
+            logger.exception("OpenAI analysis failed")
             return self._fallback_analysis(query, contents)
 
+    async def stream_content(self, query: str, contents: List[Dict], max_findings: int = 5) -> AsyncIterator[Dict]:
+        try:
+            if not self.client:
+                raise ValueError("OpenAI client not initialized")
+            async for partial in _stream_json_completion(self._create, self._analysis_request(query, contents, max_findings)):
+                yield partial
+        except Exception:
+            logger.exception("OpenAI streaming analysis failed")
+            yield self._fallback_analysis(query, contents)
+
     async def refine_query(self, original_query: str) -> str:
         try:
             prompt = f"Refine and expand this scientific research topic into an optimized search query with synonyms, sub-terms, and Boolean operators: {original_query}"
-            response = await self.client.chat.completions.create(
+            response = await self._create(
                 model=self.model,
                 messages=[{"role": "user", "content": prompt}],
                 temperature=0.5,
                 max_tokens=100
             )
             return response.choices[0].message.content.strip()
-        except Exception as e:
-            logger.error(f"OpenAI refine_query failed: {str(e)}")
+        except Exception:
+            logger.exception("OpenAI refine_query failed")
             return original_query
 
     async def generate_recommendations(self, query: str, analysis: Dict) -> List[str]:
         try:
             prompt = f"Based on this analysis of scientific papers on '{query}', suggest 3-5 follow-up research topics, gaps, or related questions: {analysis.get('summary', '')}. List them concisely as bullets."
-            response = await self.client.chat.completions.create(
+            response = await self._create(
                 model=self.model,
                 messages=[{"role": "user", "content": prompt}],
                 temperature=0.7,
                 max_tokens=300
             )
             return [rec.strip() for rec in response.choices[0].message.content.split('\n') if rec.strip() and rec.startswith('-')]
-        except Exception as e:
-            logger.error(f"OpenAI generate_recommendations failed: {str(e)}")
+        except Exception:
+            logger.exception("OpenAI generate_recommendations failed")
             return []
 
+    async def submit_batch(self, jobs: List[Tuple[str, List[Dict]]], poll_interval: float = 30.0) -> List[Dict]:
+        """Run many analyses through the OpenAI Batch API (half the price, results within 24h).
+        
+        Blocks until the batch finishes; jobs that fail come back as fallback analyses.
+        """
+        if not self.client:
+            raise ValueError("OpenAI client not initialized")
+        
+        lines = [
+            orjson.dumps({
+                "custom_id": str(idx),
+                "method": "POST",
+                "url": "/v1/chat/completions",
+                "body": self._analysis_request(query, contents)
+            })
+            for idx, (query, contents) in enumerate(jobs)
+        ]
+        batch_file = await self.client.files.create(
+            file=("analysis_batch.jsonl", b"\n".join(lines)),
+            purpose="batch"
+        )
+        batch = await self.client.batches.create(
+            input_file_id=batch_file.id,
+            endpoint="/v1/chat/completions",
+            completion_window="24h"
+        )
+        logger.info("Submitted OpenAI batch %s with %d analyses", batch.id, len(jobs))
+        
+        while batch.status not in ("completed", "failed", "expired", "cancelled"):
+            await asyncio.sleep(poll_interval)
+            batch = await self.client.batches.retrieve(batch.id)
+        
+        results = {}
+        if batch.output_file_id:
+            output = await self.client.files.content(batch.output_file_id)
+            for line in output.text.splitlines():
+                record = orjson.loads(line)
+                try:
+                    content = record["response"]["body"]["choices"][0]["message"]["content"]
+                    results[record["custom_id"]] = orjson.loads(content)
+                except (KeyError, IndexError, TypeError, ValueError):
+                    logger.warning("OpenAI batch %s: no usable result for job %s", batch.id, record.get("custom_id"))
+        
+        return [
+            results.get(str(idx)) or self._fallback_analysis(query, contents)
+            for idx, (query, contents) in enumerate(jobs)
+        ]
+
     def _fallback_analysis(self, query: str, contents: List[Dict]) -> Dict:
         """Fallback analysis if AI fails"""
         return {
@@ -131,35 +331,45 @@ Provide your analysis in JSON format with keys: summary, key_findings, themes, c
             "key_findings": ["AI analysis temporarily unavailable"],
             "themes": ["Unable to extract themes"],
             "contradictions": ["Unable to identify contradictions"],
-            "recommendations": ["Manual review recommended"]
+            "recommendations": ["Manual review recommended"],
+            "provider_used": "fallback"
         }
 
 class GeminiProvider(AIProvider):
     def __init__(self):
         self.api_key = os.getenv("GEMINI_API_KEY")
+        self.model_name = 'gemini-1.5-flash'
         self.model = None
         if self.api_key:
             genai.configure(api_key=self.api_key)
-            self.model = genai.GenerativeModel('gemini-1.5-flash')
+            self.model = genai.GenerativeModel(self.model_name)
+        self.bucket = get_bucket("gemini", self.model_name)
     
     def is_configured(self) -> bool:
         return bool(self.api_key)
     
-    async def analyze_content(self, query: str, contents: List[Dict]) -> Dict:
+    @with_retry(GEMINI_RETRYABLE)
+    async def _generate(self, prompt: str, **kwargs):
+        # Gemini is sync; wrap in async
+        await self.bucket.acquire()
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(None, lambda: self.model.generate_content(prompt, **kwargs))
+    
+    async def analyze_content(self, query: str, contents: List[Dict], max_findings: int = 5) -> Dict:
         try:
             # Prepare content
             source_texts = []
-            for idx, content in enumerate(contents[:5]):
+            for idx, content in enumerate(_dedupe_contents(contents)):
                 source_texts.append(f"""
 Source {idx + 1}: {content.get('title', 'Unknown')}
-Content: {content.get('content', '')[:2000]}
+Content: {_snippet(content, 2000)}
 ---""")
             
             prompt = f"""
 Analyze these sources about "{query}" and provide a research report with:
 
 1. Summary: Comprehensive 2-3 paragraph summary
-2. Key Findings: 5-7 important discoveries
+2. Key Findings: exactly {max_findings} important discoveries
 3. Themes: Common themes across sources
 4. Contradictions: Any conflicting information
 5. Recommendations: Actionable insights
@@ -170,50 +380,42 @@ Sources:
 Format your response as valid JSON with these exact keys: summary, key_findings (array), themes (array), contradictions (array), recommendations (array).
 """
             
-            # Gemini is sync; wrap in async
-            loop = asyncio.get_running_loop()
-            response = await loop.run_in_executor(None, lambda: self.model.generate_content(prompt))
+            response = await self._generate(prompt, generation_config=GEMINI_ANALYSIS_CONFIG)
             
-            # Parse response - Gemini might not always return valid JSON
+            # Parse response - JSON output is requested, but guard against prose around it
+            text = response.text
             try:
-                # Try to extract JSON from response
-                text = response.text
-                # Find JSON in response
-                import re
-                json_match = re.search(r'\{.*\}', text, re.DOTALL)
-                if json_match:
-                    result = json.loads(json_match.group())
-                else:
-                    # Fallback parsing
+                result = orjson.loads(text)
+            except orjson.JSONDecodeError:
+                json_text = _extract_json(text)
+                try:
+                    result = orjson.loads(json_text) if json_text else self._parse_gemini_response(text)
+                except orjson.JSONDecodeError:
                     result = self._parse_gemini_response(text)
-            except:
-                result = self._parse_gemini_response(response.text)
             
-            logger.info(f"Gemini analysis completed for query: {query}")
+            logger.info("Gemini analysis completed for query: %s", query)
             return result
             
-        except Exception as e:
-            logger.error(f"Gemini analysis failed: {str(e)}")
+        except Exception:
+            logger.exception("Gemini analysis failed")
             return self._fallback_analysis(query, contents)
     
     async def refine_query(self, original_query: str) -> str:
         try:
             prompt = f"Refine and expand this scientific research topic into an optimized search query with synonyms, sub-terms, and Boolean operators: {original_query}"
-            loop = asyncio.get_running_loop()
-            response = await loop.run_in_executor(None, lambda: self.model.generate_content(prompt))
+            response = await self._generate(prompt)
             return response.text.strip()
-        except Exception as e:
-            logger.error(f"Gemini refine_query failed: {str(e)}")
+        except Exception:
+            logger.exception("Gemini refine_query failed")
             return original_query
 
     async def generate_recommendations(self, query: str, analysis: Dict) -> List[str]:
         try:
             prompt = f"Based on this analysis of scientific papers on '{query}', suggest 3-5 follow-up research topics, gaps, or related questions: {analysis.get('summary', '')}. List them concisely as bullets."
-            loop = asyncio.get_running_loop()
-            response = await loop.run_in_executor(None, lambda: self.model.generate_content(prompt))
+            response = await self._generate(prompt)
             return [rec.strip() for rec in response.text.split('\n') if rec.strip() and rec.startswith('-')]
-        except Exception as e:
-            logger.error(f"Gemini generate_recommendations failed: {str(e)}")
+        except Exception:
+            logger.exception("Gemini generate_recommendations failed")
             return []
 
     def _parse_gemini_response(self, text: str) -> Dict:
@@ -233,7 +435,8 @@ Format your response as valid JSON with these exact keys: summary, key_findings
             "key_findings": ["Analysis unavailable"],
             "themes": [],
             "contradictions": [],
-            "recommendations": []
+            "recommendations": [],
+            "provider_used": "fallback"
         }
 
 class GroqProvider(AIProvider):
@@ -241,22 +444,28 @@ class GroqProvider(AIProvider):
         self.api_key = os.getenv("GROQ_API_KEY")
         self.client = None
         if self.api_key:
-            self.client = AsyncGroq(api_key=self.api_key)
+            self.client = AsyncGroq(api_key=self.api_key, max_retries=0)
         self.model = "llama3-8b-8192"  # Fast and good quality
+        self.bucket = get_bucket("groq", self.model)
     
     def is_configured(self) -> bool:
         return bool(self.api_key)
     
-    async def analyze_content(self, query: str, contents: List[Dict]) -> Dict:
-        try:
-            source_texts = []
-            for idx, content in enumerate(contents[:5]):
-                source_texts.append(f"""
+    @with_retry(GROQ_RETRYABLE)
+    async def _create(self, **request):
+        await self.bucket.acquire()
+        return await self.client.chat.completions.create(**request)
+    
+    def _analysis_request(self, query: str, contents: List[Dict], max_findings: int = 5) -> Dict:
+        """Chat completion parameters for an analysis; shared by the plain and streaming calls"""
+        source_texts = []
+        for idx, content in enumerate(_dedupe_contents(contents)):
+            source_texts.append(f"""
 Source {idx + 1}: {content.get('title', 'Unknown')}
-Content: {content.get('content', '')[:1500]}
+Content: {_snippet(content, 1500)}
 ---""")
-            
-            prompt = f"""
+        
+        prompt = f"""
 Analyze these sources about "{query}" and provide a structured research report.
 
 Sources:
@@ -264,59 +473,72 @@ Sources:
 
 Provide your analysis as valid JSON with these keys:
 - summary: string (2-3 paragraphs)
-- key_findings: array of strings (5-7 findings)
+- key_findings: array of strings (exactly {max_findings} findings)
 - themes: array of strings (common themes)
 - contradictions: array of strings (conflicting info)
 - recommendations: array of strings (actionable insights)
 """
-            
+        return {
+            "model": self.model,
+            "messages": [
+                {"role": "system", "content": "You are a research analyst. Always respond with valid JSON."},
+                {"role": "user", "content": prompt}
+            ],
+            "temperature": 0.7,
+            "max_tokens": 2000
+        }
+    
+    async def analyze_content(self, query: str, contents: List[Dict], max_findings: int = 5) -> Dict:
+        try:
             if not self.client:
                 raise ValueError("Groq client not initialized")
             
-            response = await self.client.chat.completions.create(
-                model=self.model,
-                messages=[
-                    {"role": "system", "content": "You are a research analyst. Always respond with valid JSON."},
-                    {"role": "user", "content": prompt}
-                ],
-                temperature=0.7,
-                max_tokens=2000
-            )
+            response = await self._create(**self._analysis_request(query, contents, max_findings))
             
-            result = json.loads(response.choices[0].message.content)
-            logger.info(f"Groq analysis completed for query: {query}")
+            result = orjson.loads(response.choices[0].message.content)
+            logger.info("Groq analysis completed for query: %s", query)
             return result
             
-        except Exception as e:
-            logger.error(f"Groq analysis failed: {str(e)}")
+        except Exception:
+            logger.exception("Groq analysis failed")
             return self._fallback_analysis(query, contents)
     
+    async def stream_content(self, query: str, contents: List[Dict], max_findings: int = 5) -> AsyncIterator[Dict]:
+        try:
+            if not self.client:
+                raise ValueError("Groq client not initialized")
+            async for partial in _stream_json_completion(self._create, self._analysis_request(query, contents, max_findings)):
+                yield partial
+        except Exception:
+            logger.exception("Groq streaming analysis failed")
+            yield self._fallback_analysis(query, contents)
+    
     async def refine_query(self, original_query: str) -> str:
         try:
             prompt = f"Refine and expand this scientific research topic into an optimized search query with synonyms, sub-terms, and Boolean operators: {original_query}"
-            response = await self.client.chat.completions.create(
+            response = await self._create(
                 model=self.model,
                 messages=[{"role": "user", "content": prompt}],
                 temperature=0.5,
                 max_tokens=100
             )
             return response.choices[0].message.content.strip()
-        except Exception as e:
-            logger.error(f"Groq refine_query failed: {str(e)}")
+        except Exception:
+            logger.exception("Groq refine_query failed")
             return original_query
 
     async def generate_recommendations(self, query: str, analysis: Dict) -> List[str]:
         try:
             prompt = f"Based on this analysis of scientific papers on '{query}', suggest 3-5 follow-up research topics, gaps, or related questions: {analysis.get('summary', '')}. List them concisely as bullets."
-            response = await self.client.chat.completions.create(
+            response = await self._create(
                 model=self.model,
                 messages=[{"role": "user", "content": prompt}],
                 temperature=0.7,
                 max_tokens=300
             )
             return [rec.strip() for rec in response.choices[0].message.content.split('\n') if rec.strip() and rec.startswith('-')]
-        except Exception as e:
-            logger.error(f"Groq generate_recommendations failed: {str(e)}")
+        except Exception:
+            logger.exception("Groq generate_recommendations failed")
             return []
 
     def _fallback_analysis(self, query: str, contents: List[Dict]) -> Dict:
@@ -325,26 +547,46 @@ Provide your analysis as valid JSON with these keys:
             "key_findings": ["Analysis unavailable"],
             "themes": [],
             "contradictions": [],
-            "recommendations": []
+            "recommendations": [],
+            "provider_used": "fallback"
         }
 
+# Providers read the environment, configure their SDK and, for Gemini, build the model once
+# per process; every AIAnalyzer shares them (and their HTTP connection pools)
+@lru_cache(maxsize=1)
+def get_openai_provider() -> OpenAIProvider:
+    return OpenAIProvider()
+
+@lru_cache(maxsize=1)
+def get_gemini_provider() -> GeminiProvider:
+    return GeminiProvider()
+
+@lru_cache(maxsize=1)
+def get_groq_provider() -> GroqProvider:
+    return GroqProvider()
+
 class AIAnalyzer:
     """Main AI analyzer that manages multiple providers"""
     
-    def __init__(self, preferred_provider: str = "groq"):
+    def __init__(self, preferred_provider: str = "groq", cache: Optional[LLMCache] = llm_cache,
+                 max_concurrency: int = 10):
         self.providers = {
-            "openai": OpenAIProvider(),
-            "gemini": GeminiProvider(), 
-            "groq": GroqProvider()
+            "openai": get_openai_provider(),
+            "gemini": get_gemini_provider(),
+            "groq": get_groq_provider()
         }
         self.preferred_provider = preferred_provider
+        self.cache = cache  # None disables caching
+        self.max_concurrency = max_concurrency  # Per provider in analyze_batch, unless AI_CONCURRENCY_{PROVIDER} is set
         
     def get_available_providers(self) -> List[str]:
         """Get list of configured providers"""
         return [name for name, provider in self.providers.items() if provider.is_configured()]
     
-    async def analyze_research(self, query: str, contents: List[Dict], provider_name: Optional[str] = None) -> Dict:
-        """Analyze research using specified or preferred provider"""
+    async def analyze_research(self, query: str, contents: List[Dict], provider_name: Optional[str] = None,
+                               max_findings: int = 5) -> Dict:
+        """Analyze research using specified or preferred provider; the prompt asks for
+        max_findings key findings so no output tokens go to ones that would be dropped"""
         
         # Use specified provider or preferred
         provider_name = provider_name or self.preferred_provider
@@ -358,15 +600,130 @@ class AIAnalyzer:
         
         # Try preferred provider first
         if provider_name in available:
-            provider = self.providers[provider_name]
-            logger.info(f"Using {provider_name} for analysis")
-            return await provider.analyze_content(query, contents)
+            logger.info("Using %s for analysis", provider_name)
+        else:
+            # Fallback to first available provider
+            fallback_name = available[0]
+            logger.info("Preferred provider %s not available. Using %s", provider_name, fallback_name)
+            provider_name = fallback_name
         
-        # Fallback to first available provider
-        fallback_name = available[0]
-        logger.info(f"Preferred provider {provider_name} not available. Using {fallback_name}")
-        provider = self.providers[fallback_name]
-        return await provider.analyze_content(query, contents)
+        return await self._analyze_cached(provider_name, query, contents, max_findings)
+    
+    async def stream_research(self, query: str, contents: List[Dict],
+                              provider_name: Optional[str] = None) -> AsyncIterator[Dict]:
+        """Like analyze_research, but yields the analysis parsed so far while the
+        provider streams it; the last item is the complete result."""
+        provider_name = provider_name or self.preferred_provider
+        available = self.get_available_providers()
+        if not available:
+            yield self._basic_analysis(query, contents)
+            return
+        if provider_name not in available:
+            provider_name = available[0]
+        provider = self.providers[provider_name]
+        
+        key = None
+        if self.cache is not None:
+            key = self.cache.cache_key(provider_name, getattr(provider, "model_name", provider.model), query,
+                                       _dedupe_contents(contents))
+            cached = await self.cache.get(key)
+            if cached is not None:
+                yield cached
+                return
+        
+        result = None
+        async for result in provider.stream_content(query, contents):
+            yield result
+        
+        if key is not None and result is not None and result.get("provider_used") != "fallback":
+            await self.cache.set(key, result)
+    
+    async def analyze_research_hedged(self, query: str, contents: List[Dict],
+                                      providers: Tuple[str, ...] = ("groq", "gemini"),
+                                      hedge_delay: float = 0.5) -> Dict:
+        """Analyze with hedged requests: start the first provider, add the next one
+        each time hedge_delay passes without an answer, and return the first real
+        result, cancelling the rest. Fallback placeholders do not count as answers.
+        """
+        available = set(self.get_available_providers())
+        remaining = [name for name in providers if name in available]
+        if not remaining:
+            return await self.analyze_research(query, contents)
+        
+        pending = set()
+        fallback = None
+        try:
+            while remaining or pending:
+                if remaining:
+                    name = remaining.pop(0)
+                    pending.add(asyncio.create_task(self._analyze_cached(name, query, contents)))
+                
+                # Only wait hedge_delay while there is still another provider to start
+                done, pending = await asyncio.wait(
+                    pending,
+                    timeout=hedge_delay if remaining else None,
+                    return_when=asyncio.FIRST_COMPLETED
+                )
+                for task in done:
+                    if task.exception() is not None:
+                        logger.warning("Hedged analysis request failed: %s", task.exception())
+                        continue
+                    result = task.result()
+                    if result.get("provider_used") != "fallback":
+                        return result
+                    fallback = result
+        finally:
+            # Losing requests are dropped before they reach the cache
+            for task in pending:
+                task.cancel()
+        
+        return fallback or self._basic_analysis(query, contents)
+    
+    async def analyze_batch(self, queries: List[Tuple[str, List[Dict]]], provider_name: Optional[str] = None,
+                            use_batch_api: bool = False) -> List[Dict]:
+        """Analyze several (query, contents) pairs concurrently; results keep the input order.
+        
+        With use_batch_api and OpenAI as the provider, the jobs go through the
+        OpenAI Batch API instead, which is cheaper but can take hours.
+        """
+        provider_name = provider_name or self.preferred_provider
+        available = self.get_available_providers()
+        if not available:
+            return [self._basic_analysis(query, contents) for query, contents in queries]
+        if provider_name not in available:
+            provider_name = available[0]
+        
+        if use_batch_api and provider_name == "openai":
+            return await self.providers["openai"].submit_batch(queries)
+        
+        # Created per call: a semaphore is bound to the event loop it is first used on
+        semaphore = asyncio.Semaphore(provider_concurrency(provider_name, self.max_concurrency))
+        
+        async def guarded(query: str, contents: List[Dict]) -> Dict:
+            async with semaphore:
+                return await self._analyze_cached(provider_name, query, contents)
+        
+        return await asyncio.gather(*(guarded(query, contents) for query, contents in queries))
+    
+    async def _analyze_cached(self, provider_name: str, query: str, contents: List[Dict],
+                              max_findings: int = 5) -> Dict:
+        """Run a provider's analysis, reusing a cached result for the same query and sources"""
+        provider = self.providers[provider_name]
+        if self.cache is None:
+            return await provider.analyze_content(query, contents, max_findings)
+        
+        model = getattr(provider, "model_name", provider.model)
+        key = self.cache.cache_key(provider_name, model, query, _dedupe_contents(contents), max_findings)
+        cached = await self.cache.get(key)
+        if cached is not None:
+            logger.info("LLM cache hit for %s analysis", provider_name)
+            return cached
+        
+        result = await provider.analyze_content(query, contents, max_findings)
+        # Fallback placeholders are not worth keeping; the next run should retry the provider
+        if result.get("provider_used") != "fallback":
+            await self.cache.set(key, result)
+        return result
     
     async def refine_query(self, original_query: str, provider_name: Optional[str] = None) -> str:
         provider_name = provider_name or self.preferred_provider
@@ -374,13 +731,23 @@ class AIAnalyzer:
         if not available:
             return original_query
         
-        if provider_name in available:
-            provider = self.providers[provider_name]
+        if provider_name not in available:
+            provider_name = available[0]
+        provider = self.providers[provider_name]
+        if self.cache is None:
             return await provider.refine_query(original_query)
         
-        fallback_name = available[0]
-        provider = self.providers[fallback_name]
-        return await provider.refine_query(original_query)
+        # Re-running the same query should not pay for another LLM round trip
+        key = self.cache.refine_key(provider_name, getattr(provider, "model_name", provider.model), original_query)
+        cached = await self.cache.get(key)
+        if cached is not None:
+            return cached
+        
+        refined = await provider.refine_query(original_query)
+        # Providers return the original query when they fail; leave that uncached
+        if refined and refined != original_query:
+            await self.cache.set(key, refined)
+        return refined
     
     async def generate_recommendations(self, query: str, analysis: Dict, provider_name: Optional[str] = None) -> List[str]:
         provider_name = provider_name or self.preferred_provider
@@ -412,4 +779,10 @@ class AIAnalyzer:
             "contradictions": ["Unable to analyze without AI"],
             "recommendations": ["Configure AI provider for better analysis"],
             "provider_used": "basic"
-        }
\ No newline at end of file
+        }
+
+
+@lru_cache(maxsize=None)
+def get_analyzer(preferred_provider: str = "groq") -> AIAnalyzer:
+    """Process-wide analyzer per preferred provider; usable directly as a FastAPI dependency"""
+    return AIAnalyzer(preferred_provider=preferred_provider)
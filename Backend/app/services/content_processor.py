@@ -1,10 +1,30 @@
-from typing import List, Dict
+from typing import List, Dict, Tuple
+from bisect import bisect_right
 import re
 from collections import Counter
 import logging
 
 logger = logging.getLogger(__name__)
 
+# A sentence without its surrounding whitespace: a run between . ! ? that starts and ends on a visible character
+SENTENCE_RE = re.compile(r'[^.!?\s](?:[^.!?]*[^.!?\s])?')
+
+# Sentences worth surfacing as key points mention one of these words
+KEYWORD_RE = re.compile(r'\b(?:important|key|main|essential|critical|must|should|need)\b', re.IGNORECASE)
+NUM_RE = re.compile(r'\d')
+# Candidate keywords: whole lowercase words of 4+ letters, so short words never leave the regex engine
+KEYWORD_WORD_RE = re.compile(r'\b[a-z]{4,}\b')
+
+# Longest slice of a source any AI provider puts in its prompt
+PROMPT_SNIPPET_LENGTH = 2000
+
+# Common words ignored by extract_keywords
+STOP_WORDS = frozenset({
+    'the', 'a', 'an', 'and', 'or', 'but', 'in', 'on', 'at', 'to', 'for',
+    'of', 'with', 'by', 'is', 'was', 'are', 'were', 'been', 'be', 'have',
+    'has', 'had', 'do', 'does', 'did', 'will', 'would', 'could', 'should'
+})
+
 class ContentProcessor:
     def __init__(self):
         self.min_content_length = 100
@@ -19,7 +39,8 @@ class ContentProcessor:
                 'summary': 'Content could not be retrieved',
                 'key_points': [],
                 'word_count': 0,
-                'relevance_score': 0.0
+                'relevance_score': 0.0,
+                'prompt_snippet': ''
             }
         
         content = scraped_data['content']
@@ -30,7 +51,8 @@ class ContentProcessor:
             'summary': self._generate_summary(content),
             'key_points': self._extract_key_points(content),
             'word_count': len(content.split()),
-            'relevance_score': self._calculate_relevance(content)
+            'relevance_score': self._calculate_relevance(content),
+            'prompt_snippet': content[:PROMPT_SNIPPET_LENGTH]
         }
     
     def _generate_summary(self, content: str) -> str:
@@ -52,25 +74,32 @@ class ContentProcessor:
     
     def _extract_key_points(self, content: str) -> List[str]:
         """Extract key points from content"""
-        sentences = self._split_into_sentences(content)
+        spans = self._sentence_spans(content)[:20]  # Check first 20 sentences
+        if not spans:
+            return []
+        starts = [start for start, _ in spans]
         key_points = []
         
-        # Simple heuristic: look for sentences with keywords
-        keywords = ['important', 'key', 'main', 'essential', 'critical', 'must', 'should', 'need']
-        
-        for sentence in sentences[:20]:  # Check first 20 sentences
-            if any(keyword in sentence.lower() for keyword in keywords):
-                key_points.append(sentence.strip())
-                if len(key_points) >= 3:
-                    break
+        # Simple heuristic: look for sentences with keywords. The content is scanned
+        # once and each match mapped back to its sentence, so no sentence is sliced
+        # unless it is returned.
+        last = -1
+        for match in KEYWORD_RE.finditer(content, spans[0][0], spans[-1][1]):
+            idx = bisect_right(starts, match.start()) - 1
+            if idx == last or match.start() >= spans[idx][1]:
+                continue  # Same sentence again, or a fragment too short to count
+            last = idx
+            key_points.append(content[starts[idx]:spans[idx][1]])
+            if len(key_points) >= 3:
+                return key_points
         
         # If no keyword sentences found, take sentences with numbers/statistics
         if len(key_points) < 2:
-            for sentence in sentences[:20]:
-                if re.search(r'\d+', sentence):  # Contains numbers
-                    key_points.append(sentence.strip())
-                    if len(key_points) >= 3:
-                        break
+            for start, end in spans:
+                if len(key_points) >= 3:
+                    break
+                if NUM_RE.search(content, start, end):
+                    key_points.append(content[start:end])
         
         return key_points[:3]  # Return top 3 key points
     
@@ -88,23 +117,21 @@ class ContentProcessor:
         else:
             return 0.9
     
+    def _sentence_spans(self, text: str) -> List[Tuple[int, int]]:
+        """(start, end) offsets of the sentences in text, very short ones left out"""
+        return [match.span() for match in SENTENCE_RE.finditer(text) if match.end() - match.start() > 20]
+    
     def _split_into_sentences(self, text: str) -> List[str]:
         """Split text into sentences"""
-        # Simple sentence splitting
-        sentences = re.split(r'[.!?]+', text)
-        # Filter out very short sentences
-        return [s.strip() for s in sentences if len(s.strip()) > 20]
+        # Simple sentence splitting; filter out very short sentences
+        return [text[start:end] for start, end in self._sentence_spans(text)]
     
     def extract_keywords(self, content: str, num_keywords: int = 5) -> List[str]:
         """Extract keywords from content"""
-        # Simple keyword extraction based on word frequency
-        # Remove common words
-        stop_words = {'the', 'a', 'an', 'and', 'or', 'but', 'in', 'on', 'at', 'to', 'for', 
-                     'of', 'with', 'by', 'is', 'was', 'are', 'were', 'been', 'be', 'have', 
-                     'has', 'had', 'do', 'does', 'did', 'will', 'would', 'could', 'should'}
-        
-        words = re.findall(r'\b[a-z]+\b', content.lower())
-        words = [w for w in words if w not in stop_words and len(w) > 3]
-        
-        word_freq = Counter(words)
+        # Simple keyword extraction based on word frequency. Tokens are counted
+        # in C (findall + Counter); stop words are then dropped once per distinct
+        # word instead of being checked on every token.
+        word_freq = Counter(KEYWORD_WORD_RE.findall(content.lower()))
+        for stop_word in STOP_WORDS.intersection(word_freq):
+            del word_freq[stop_word]
         return [word for word, _ in word_freq.most_common(num_keywords)]
\ No newline at end of file
@@ -0,0 +1,51 @@
+import hashlib
+import logging
+from typing import Any, Dict, List, Optional
+
+import orjson
+
+from app.core.cache import cache_get, cache_set
+
+logger = logging.getLogger(__name__)
+
+class LLMCache:
+    """Redis cache for LLM analyses and refined queries, keyed by provider, model, query and source contents"""
+    
+    def __init__(self, ttl: int = 3600, prefix: str = "llm"):
+        self.ttl = ttl
+        self.prefix = prefix
+    
+    def cache_key(self, provider: str, model: str, query: str, contents: List[Dict], max_findings: int = 5) -> str:
+        """Stable key for an analysis; only the parts of each source that reach the prompt are hashed,
+        so `contents` must be the sources the provider sends (see ai_analyzer._dedupe_contents)"""
+        source_hashes = [
+            hashlib.sha256(
+                f"{c.get('title', '')}\n{c.get('url', '')}\n{(c.get('prompt_snippet') or c.get('content') or '')[:2000]}".encode()
+            ).hexdigest()
+            for c in contents
+        ]
+        payload = {
+            "p": provider,
+            "m": model,
+            "q": " ".join(query.lower().split()),
+            "h": source_hashes,
+            "f": max_findings,
+        }
+        digest = hashlib.sha256(orjson.dumps(payload, option=orjson.OPT_SORT_KEYS)).hexdigest()
+        return f"{self.prefix}:{digest}"
+    
+    def refine_key(self, provider: str, model: str, query: str) -> str:
+        """Key for a refined search query"""
+        payload = {"p": provider, "m": model, "q": " ".join(query.lower().split())}
+        digest = hashlib.sha256(orjson.dumps(payload, option=orjson.OPT_SORT_KEYS)).hexdigest()
+        return f"{self.prefix}:refine:{digest}"
+    
+    async def get(self, key: str) -> Optional[Any]:
+        cached = await cache_get(key)
+        return orjson.loads(cached) if cached is not None else None
+    
+    async def set(self, key: str, value: Any) -> None:
+        await cache_set(key, orjson.dumps(value), self.ttl)
+
+# Shared instance used by AIAnalyzer
+llm_cache = LLMCache()
@@ -0,0 +1,104 @@
+import asyncio
+import functools
+import logging
+import os
+import random
+import threading
+import time
+from email.utils import parsedate_to_datetime
+from typing import Dict, Optional, Tuple, Type
+
+from dotenv import load_dotenv
+
+load_dotenv()
+logger = logging.getLogger(__name__)
+
+# Attempts per provider call, including the first one
+AI_RETRY_MAX_ATTEMPTS = int(os.getenv("AI_RETRY_MAX_ATTEMPTS", "5"))
+
+# Requests per minute allowed per provider unless AI_RPM_{PROVIDER} overrides it (free-tier limits)
+DEFAULT_RPM = {"openai": 500, "gemini": 15, "groq": 30}
+
+class TokenBucket:
+    """Token bucket that refills `rate` tokens per second up to `capacity`.
+
+    Holds no asyncio primitives, so one bucket can be shared across event loops
+    (Celery tasks start a new loop per asyncio.run). A thread lock guards the
+    refill and take, since with the threads pool those loops run concurrently.
+    """
+
+    def __init__(self, rate: float, capacity: int):
+        self.rate = rate
+        self.capacity = capacity
+        self.tokens = float(capacity)
+        self.updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    async def acquire(self, tokens: int = 1) -> None:
+        """Wait until `tokens` are available and take them"""
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+                self.updated = now
+                if self.tokens >= tokens:
+                    self.tokens -= tokens
+                    return
+                wait = (tokens - self.tokens) / self.rate
+            await asyncio.sleep(wait)
+
+_buckets: Dict[Tuple[str, str], TokenBucket] = {}
+_buckets_lock = threading.Lock()
+
+def provider_concurrency(provider: str, default: int) -> int:
+    """Requests in flight allowed for a provider, from AI_CONCURRENCY_{PROVIDER}"""
+    return int(os.getenv(f"AI_CONCURRENCY_{provider.upper()}", default))
+
+def get_bucket(provider: str, model: str) -> TokenBucket:
+    """Shared rate limiter for a (provider, model) pair"""
+    key = (provider, model)
+    with _buckets_lock:
+        bucket = _buckets.get(key)
+        if bucket is None:
+            rpm = float(os.getenv(f"AI_RPM_{provider.upper()}", DEFAULT_RPM.get(provider, 60)))
+            bucket = _buckets[key] = TokenBucket(rpm / 60, provider_concurrency(provider, 10))
+    return bucket
+
+def _retry_after(error: Exception) -> Optional[float]:
+    """Seconds requested by a Retry-After header on the error's response, if any"""
+    response = getattr(error, "response", None)
+    value = response.headers.get("Retry-After") if response is not None else None
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+    except (TypeError, ValueError):
+        return None
+
+def with_retry(retry_on: Tuple[Type[BaseException], ...], max_attempts: int = AI_RETRY_MAX_ATTEMPTS,
+               base: float = 0.5, jitter: float = 0.2, max_delay: float = 30.0):
+    """Retry a coroutine on `retry_on` errors with exponential backoff and jitter,
+    waiting for Retry-After instead when the server sends one"""
+    def decorator(func):
+        @functools.wraps(func)
+        async def wrapper(*args, **kwargs):
+            for attempt in range(1, max_attempts + 1):
+                try:
+                    return await func(*args, **kwargs)
+                except retry_on as e:
+                    if attempt == max_attempts:
+                        raise
+                    delay = _retry_after(e)
+                    if delay is None:
+                        delay = base * 2 ** (attempt - 1)
+                        delay *= 1 + random.uniform(-jitter, jitter)
+                    delay = min(delay, max_delay)
+                    logger.warning("%s failed (%s), retry %d/%d in %.1fs",
+                                   func.__qualname__, type(e).__name__, attempt, max_attempts - 1, delay)
+                    await asyncio.sleep(delay)
+        return wrapper
+    return decorator
@@ -1,14 +1,95 @@
+import asyncio
+import hashlib
+import multiprocessing
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
 import httpx
-from bs4 import BeautifulSoup
-from typing import List, Dict, Optional
-import time
+from selectolax.parser import HTMLParser
+from typing import Callable, List, Dict, Optional
 from urllib.parse import urlparse, quote
+from weakref import WeakKeyDictionary
 import logging
-from trafilatura import fetch_url, extract
+from trafilatura import extract
 import json
 
+from app.core.cache import cached_async
+from app.core.config import settings
+
 logger = logging.getLogger(__name__)
 
+# Main content containers in order of preference, matched in a single tree walk
+CONTENT_SELECTOR = 'main, article, div.content, div.main, div#content'
+
+# Site-specific extractors keyed by host: they take the parsed page and return the
+# article text (or None to fall back to the generic trafilatura pipeline)
+DOMAIN_EXTRACTORS: Dict[str, Callable[[HTMLParser], Optional[str]]] = {}
+
+def register_extractor(*hosts: str):
+    """Register the decorated function as the content extractor for the given hosts"""
+    def decorator(func: Callable[[HTMLParser], Optional[str]]):
+        for host in hosts:
+            DOMAIN_EXTRACTORS[host] = func
+        return func
+    return decorator
+
+def _selector_extractor(selector: str) -> Callable[[HTMLParser], Optional[str]]:
+    """Extractor returning the text of the first node matching selector"""
+    def extract_selected(tree: HTMLParser) -> Optional[str]:
+        node = tree.css_first(selector)
+        if node is None:
+            return None
+        for junk in node.css('script, style'):
+            junk.decompose()
+        return node.text(separator='\n', strip=True) or None
+    return extract_selected
+
+# Stable layouts of frequently cited sites; a single CSS query beats generic extraction
+for _host, _selector in {
+    "en.wikipedia.org": "#mw-content-text .mw-parser-output",
+    "developer.mozilla.org": "main#content",
+    "docs.python.org": "div.body",
+    "arxiv.org": "blockquote.abstract",
+}.items():
+    register_extractor(_host)(_selector_extractor(_selector))
+
+# Created on first use so every process (e.g. each Celery prefork child) gets its own pool
+_extract_pool: Optional[ProcessPoolExecutor] = None
+_extract_pool_lock = threading.Lock()  # Tasks on the threads pool may race to create or replace it
+
+def _extract_sync(html: str) -> Optional[str]:
+    """trafilatura article extraction; module level so pool workers can unpickle it"""
+    return extract(html, include_comments=False, include_tables=False)
+
+async def _extract_in_pool(html: str) -> Optional[str]:
+    """Run _extract_sync on another core; falls back to a thread where a pool cannot be used"""
+    global _extract_pool
+    if multiprocessing.current_process().daemon:
+        # Daemonic processes (Celery prefork children) may not fork their own workers
+        return await asyncio.to_thread(_extract_sync, html)
+    
+    with _extract_pool_lock:
+        if _extract_pool is None:
+            _extract_pool = ProcessPoolExecutor(max_workers=settings.scrape_extract_workers)
+        pool = _extract_pool
+    try:
+        return await asyncio.get_running_loop().run_in_executor(pool, _extract_sync, html)
+    except BrokenProcessPool:
+        # A worker died (e.g. killed on a huge page); replace the pool and retry here
+        with _extract_pool_lock:
+            if _extract_pool is pool:
+                logger.warning("HTML extraction pool broke; recreating it")
+                _extract_pool = None
+        pool.shutdown(wait=False)
+        return await asyncio.to_thread(_extract_sync, html)
+
+def _search_cache_key(scraper, query: str, num_results: int) -> str:
+    digest = hashlib.sha256(query.lower().strip().encode()).hexdigest()
+    return f"ddg:{digest}:{num_results}"
+
+def _scrape_cache_key(scraper, client, url: str) -> str:
+    return f"scrape:{hashlib.sha256(url.encode()).hexdigest()}"
+
 class WebScraper:
     def __init__(self):
         self.headers = {
@@ -16,83 +97,141 @@ class WebScraper:
         }
         self.timeout = 10.0
         self.rate_limit_delay = 1.0  # Respectful delay between requests
+        # One pooled client per event loop (Celery tasks start a new one per asyncio.run), so
+        # TLS handshakes and DNS lookups are paid once per host instead of once per request
+        self._clients: "WeakKeyDictionary[asyncio.AbstractEventLoop, httpx.AsyncClient]" = WeakKeyDictionary()
+    
+    async def __aenter__(self) -> "WebScraper":
+        return self
+    
+    async def __aexit__(self, *exc_info) -> None:
+        await self.aclose()
+    
+    def _get_client(self) -> httpx.AsyncClient:
+        """Shared keep-alive client for the current event loop"""
+        loop = asyncio.get_running_loop()
+        client = self._clients.get(loop)
+        if client is None:
+            # Connection failures are retried by the transport; HTTP/2 multiplexes requests to the same host
+            transport = httpx.AsyncHTTPTransport(
+                retries=2,
+                http2=True,
+                limits=httpx.Limits(max_connections=32, max_keepalive_connections=16)
+            )
+            client = httpx.AsyncClient(
+                headers=self.headers, timeout=self.timeout, follow_redirects=True, transport=transport
+            )
+            self._clients[loop] = client
+        return client
+    
+    async def aclose(self) -> None:
+        """Close the shared HTTP client of the running event loop"""
+        client = self._clients.pop(asyncio.get_running_loop(), None)
+        if client is not None:
+            await client.aclose()
         
     async def search_web(self, query: str, num_results: int = 5) -> List[Dict]:
         """Search the web using DuckDuckGo (no API key needed)"""
-        results = []
-        
         try:
-            # Use DuckDuckGo HTML version for scraping
-            search_url = f"https://html.duckduckgo.com/html/?q={quote(query)}"
-            
-            async with httpx.AsyncClient() as client:
-                response = await client.get(
-                    search_url,
-                    headers=self.headers,
-                    timeout=self.timeout,
-                    follow_redirects=True
-                )
-                response.raise_for_status()
-                
-            soup = BeautifulSoup(response.text, 'html.parser')
-            
-            # Find search results
-            for i, result in enumerate(soup.find_all('div', class_='web-result')[:num_results]):
-                title_elem = result.find('h2')
-                link_elem = result.find('a', class_='result__a')
-                snippet_elem = result.find('a', class_='result__snippet')
-                
-                if title_elem and link_elem:
-                    results.append({
-                        'title': title_elem.get_text(strip=True),
-                        'url': link_elem.get('href', ''),
-                        'snippet': snippet_elem.get_text(strip=True) if snippet_elem else ''
-                    })
-                    
+            return await self._search_duckduckgo(query, num_results)
         except Exception as e:
-            logger.error(f"Search error: {str(e)}")
+            logger.error("Search error: %s", e)
             # Fallback to predefined educational sources
-            results = self._get_fallback_sources(query)
+            return self._get_fallback_sources(query)
+    
+    @cached_async(settings.search_cache_ttl, key_fn=_search_cache_key)
+    async def _search_duckduckgo(self, query: str, num_results: int) -> List[Dict]:
+        # Use DuckDuckGo HTML version for scraping
+        search_url = f"https://html.duckduckgo.com/html/?q={quote(query)}"
+        
+        response = await self._get_client().get(search_url)
+        response.raise_for_status()
+        
+        tree = HTMLParser(response.text)
+        
+        # Find search results
+        results = []
+        for result in tree.css('div.web-result')[:num_results]:
+            title_elem = result.css_first('h2')
+            link_elem = result.css_first('a.result__a')
+            snippet_elem = result.css_first('a.result__snippet')
             
+            if title_elem and link_elem:
+                results.append({
+                    'title': title_elem.text(strip=True),
+                    'url': link_elem.attributes.get('href') or '',
+                    'snippet': snippet_elem.text(strip=True) if snippet_elem else ''
+                })
+        
         return results
     
+    async def scrape_many(self, urls: List[str], concurrency: int = 8) -> List[Dict]:
+        """Scrape several URLs concurrently, at most `concurrency` at a time"""
+        semaphore = asyncio.Semaphore(concurrency)
+        
+        async def scrape(client: httpx.AsyncClient, url: str) -> Dict:
+            async with semaphore:
+                return await self._scrape_one(client, url)
+        
+        client = self._get_client()
+        return await asyncio.gather(*(scrape(client, url) for url in urls))
+    
     async def scrape_content(self, url: str) -> Optional[Dict]:
         """Scrape content from a URL using multiple methods"""
+        return await self._scrape_one(self._get_client(), url)
+    
+    # Failed scrapes are retried next time rather than cached
+    @cached_async(settings.scrape_cache_ttl, key_fn=_scrape_cache_key, cache_if=lambda page: page['success'])
+    async def _scrape_one(self, client: httpx.AsyncClient, url: str) -> Dict:
         try:
             # Add delay for respectful scraping
-            time.sleep(self.rate_limit_delay)
+            await asyncio.sleep(self.rate_limit_delay)
             
-            # Method 1: Try trafilatura first (best for article extraction)
-            html = fetch_url(url)
-            if html:
-                content = extract(html, include_comments=False, include_tables=False)
+            # Fetched once; both extraction methods work on this body
+            response = await client.get(url)
+            response.raise_for_status()
+            html = response.text
+            
+            # Method 0: Known sites have a dedicated extractor
+            host = urlparse(url).netloc
+            extractor = DOMAIN_EXTRACTORS.get(host)
+            if extractor is not None:
+                tree = HTMLParser(html)
+                content = extractor(tree)
                 if content:
+                    title_tag = tree.css_first('title')
                     return {
                         'url': url,
                         'content': content,
-                        'title': self._extract_title_from_html(html),
+                        'title': title_tag.text(strip=True) if title_tag else host,
                         'success': True
                     }
+                logger.info("Extractor for %s found no content on %s; using generic extraction", host, url)
+            else:
+                # Frequent hosts here are candidates for register_extractor
+                logger.debug("No site extractor for %s", host)
             
-            # Method 2: Fallback to BeautifulSoup
-            async with httpx.AsyncClient() as client:
-                response = await client.get(
-                    url,
-                    headers=self.headers,
-                    timeout=self.timeout,
-                    follow_redirects=True
-                )
-                response.raise_for_status()
-                
-            soup = BeautifulSoup(response.text, 'html.parser')
+            # Method 1: Try trafilatura first (best for article extraction); CPU-bound, so in another process
+            content = await _extract_in_pool(html)
+            if content:
+                return {
+                    'url': url,
+                    'content': content,
+                    'title': self._extract_title_from_html(html),
+                    'success': True
+                }
+            
+            # Method 2: Fallback to parsing the page ourselves
+            tree = HTMLParser(html)
             
             # Remove script and style elements
-            for script in soup(["script", "style"]):
-                script.decompose()
+            for node in tree.css('script, style'):
+                node.decompose()
                 
             # Extract text content
-            content = self._extract_content_from_soup(soup)
-            title = soup.find('title').get_text() if soup.find('title') else urlparse(url).netloc
+            content = self._extract_content(tree)
+            title_tag = tree.css_first('title')
+            title = title_tag.text() if title_tag else urlparse(url).netloc
             
             return {
                 'url': url,
@@ -102,7 +241,7 @@ class WebScraper:
             }
             
         except Exception as e:
-            logger.error(f"Scraping error for {url}: {str(e)}")
+            logger.error("Scraping error for %s: %s", url, e)
             return {
                 'url': url,
                 'content': f"Failed to scrape: {str(e)}",
@@ -110,33 +249,16 @@ class WebScraper:
                 'success': False
             }
     
-    def _extract_content_from_soup(self, soup: BeautifulSoup) -> str:
-        """Extract main content from BeautifulSoup object"""
-        # Try to find main content areas
-        content_areas = [
-            soup.find('main'),
-            soup.find('article'),
-            soup.find('div', class_='content'),
-            soup.find('div', class_='main'),
-            soup.find('div', id='content'),
-        ]
-        
-        for area in content_areas:
-            if area:
-                return area.get_text(separator='\n', strip=True)
-        
-        # Fallback to body
-        body = soup.find('body')
-        if body:
-            return body.get_text(separator='\n', strip=True)
-        
-        return ""
+    def _extract_content(self, tree: HTMLParser) -> str:
+        """Extract main content from a parsed page"""
+        # Try to find main content areas, falling back to body
+        area = tree.css_first(CONTENT_SELECTOR) or tree.body
+        return area.text(separator='\n', strip=True) if area else ""
     
     def _extract_title_from_html(self, html: str) -> str:
         """Extract title from HTML string"""
-        soup = BeautifulSoup(html, 'html.parser')
-        title_tag = soup.find('title')
-        return title_tag.get_text(strip=True) if title_tag else "Untitled"
+        title_tag = HTMLParser(html).css_first('title')
+        return title_tag.text(strip=True) if title_tag else "Untitled"
     
     def _get_fallback_sources(self, query: str) -> List[Dict]:
         """Provide fallback sources when search fails"""
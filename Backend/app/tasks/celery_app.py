@@ -17,9 +17,12 @@ is_windows = os.name == "nt"
 # Celery configuration
 celery_app.conf.update(
     # Task settings
-    task_serializer="json",
-    accept_content=["json"],
-    result_serializer="json",
+    # msgpack is smaller and faster to (de)serialize than JSON; JSON is still
+    # accepted so messages queued before a deploy can drain
+    task_serializer="msgpack",
+    accept_content=["msgpack", "json"],
+    result_serializer="msgpack",
+    result_accept_content=["msgpack", "json"],
     timezone="UTC",
     enable_utc=True,
 
@@ -29,15 +32,19 @@ celery_app.conf.update(
 
 
     # Windows Compatibility
-    worker_pool='solo' if is_windows else 'prefork',
+    worker_pool=settings.celery_worker_pool or ('solo' if is_windows else 'prefork'),
+    worker_concurrency=settings.celery_worker_concurrency or None,
     
     # Result backend settings
     result_expires=3600,  # Results expire after 1 hour
+    result_compression="zstd",  # Research results carry summaries and findings text
 
     # Task routing
-    # task_routes={
-    #    "app.tasks.research_tasks.*": {"queue": "research_tasks"},
-    # },
+    # Batched research needs a worker that prefetches everything:
+    #   celery -A app.tasks.celery_app worker -Q research_batches --prefetch-multiplier=0
+    task_routes={
+        "app.tasks.research_tasks.process_research_batch": {"queue": "research_batches"},
+    },
 )
 
 # Optional: Add periodic task settings
@@ -1,12 +1,14 @@
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import ORJSONResponse
 from app.api.v1.api import api_router
 
 # Create FastAPI app with metadata
 app = FastAPI(
     title="Research Assistant API",
     description="Automated research and analysis platform",
-    version="1.0.0"
+    version="1.0.0",
+    default_response_class=ORJSONResponse  # orjson serializes large source lists much faster than json
 )
 # Add CORS middleware for frontend integration
 app.add_middleware(
@@ -31,6 +31,7 @@ export const researchApi = {
     page?: number;
     page_size?: number;
     status?: string;
+    cursor?: string;
   }): Promise<ResearchListResponse> => {
     const response = await apiClient.get('/research/', { params });
     return response.data;
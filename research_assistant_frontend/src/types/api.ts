@@ -50,9 +50,11 @@ export interface ResearchListResponse {
   success: boolean;
   message: string;
   research_list: ResearchSummary[];
-  total: number;
-  page: number;
+  total?: number; // omitted in cursor mode
+  page?: number; // omitted in cursor mode
   page_size: number;
+  next_cursor?: string;
+  has_more: boolean;
 }
 
 export interface ResearchSummary {